@@ -1,13 +1,24 @@
 import tkinter as tk
+from tkinter import ttk, messagebox
 from my_package.ui import QuizUI
-from my_package.quiz_logic import check_answer, generate_questions
+from my_package.quiz_logic import check_answer, format_pokemon_name, QuestionBank
 from my_package.data_fetching import fetch_pokemon_data, load_egg_group_cache
-from my_package.utils import meters_to_feet_inches, kg_to_lbs, set_unit_system, load_unit_preference
+from my_package.utils import meters_to_feet_inches, kg_to_lbs, set_unit_system, load_unit_preference, load_storage_preference
 from my_package.sprite_cacher import cache_sprites
+from my_package.sqlite_store import open_repository
+from my_package.lazy_store import open_lazy_data
+from my_package.name_index import build_name_index, name_key
+from my_package.name_search import NameSuggester
+from my_package.flavor_index import load_flavor_index, FlavorPool
+from my_package.cache_manifest import check_cache, update_manifest
+from my_package.ui_events import UIEventBus
+from my_package.progress import TkRenderer
 import my_package.cache_clearer as clearer
 import os
 import winsound
 import threading
+import random
+import time
 import json
 import re
 
@@ -22,8 +33,18 @@ cache_dir = "professor_cache"
 class ProfessorLocke:
     def __init__(self, root):
         self.cache_flag = None
+        self.data = None
+        self.suggester = None # autocomplete, ready once data is loaded
+        self.name_index = None # these three point into self.data, so they come and go with it
+        self.all_pokemon = None
+        self.question_bank = None
+        self.flavor_pool = None # pokedex entries, cleaned and censored when professordata was built
+        # question randomness; PROFESSOR_SEED=<anything> replays the same picks, handy for reproducing a quiz
+        self.rng = random.Random(os.environ.get("PROFESSOR_SEED"))
+        self.use_sqlite = load_storage_preference() # optional sqlite backend instead of the full list in memory
         # Load unit preference
         use_metric = load_unit_preference()
+        self.use_metric = use_metric
         #starts the main thing
         self.ui = QuizUI(
             root,
@@ -31,7 +52,8 @@ class ProfessorLocke:
             on_prev_question=self.prev_question,
             on_next_question=self.next_question,
             clear_cache=self.clear_cache,
-            on_unit_toggle=self.toggle_unit_system
+            on_unit_toggle=self.toggle_unit_system,
+            on_suggest=self.suggest_names
         )
         # Set initial unit preference
         self.ui.unit_var.set(use_metric)
@@ -43,93 +65,78 @@ class ProfessorLocke:
         # label for fetching data to display current status underneath loading label
         self.fetching_label = tk.Label(root, text="", font=("Arial", 16))
         self.fetching_label.pack(pady=10)
+        # fills in from the structured progress events (done/total), under the fetching label
+        self.progress_bar = ttk.Progressbar(root, length=400, mode="determinate")
+        self.progress_bar.pack(pady=5)
+        # worker threads post status here, the main loop applies it (latest message only, once per frame)
+        self.events = UIEventBus(root)
+        self.events.subscribe("loading", TkRenderer(self.loading_label))
+        self.events.subscribe("fetching", TkRenderer(self.fetching_label, self.progress_bar))
+        self.events.start()
 
         # Show loading message before starting data checks and download(s)
         self.set_loading_message("Initializing...")
-        self.check_data(cache_dir)
         self.check_list = self.check_data(cache_dir) # what data we need to download
         root.after(100, self.load_data) #load/download depending on check list
 
-    #checks data, returns "true" to dict
+    #checks data against the cache manifest, returns "true" to dict for what's already good
     def check_data(self, cache_dir):
-        sprites_dir = os.path.join(cache_dir, "sprites")
-        poke_file = os.path.join(cache_dir, "professordata.json")
-        egg_file = os.path.join(cache_dir, "egg_groups.json")
-
-        check_dict = {
-            "poke_file": False,
-            "sprites_dir": False,
-            "egg_groups": False
-        }
-
-        if os.path.exists(poke_file): #professordata.json
-            check_dict["poke_file"] = True
-
-        if os.path.exists(sprites_dir): #sprites directory
-            util_file = os.path.join(cache_dir, "utility.json")
-            def load_counter():
-                """Load the sprite download counter."""
-                if os.path.exists(util_file): #stored count of the sprites as they're downloaded/cached. If we don't match this count, it re-runs itself and comes to the correct number as it downloads/verifies.
-                    try:
-                        with open(util_file, 'r') as f:
-                            data = json.load(f)
-                            return data.get("total_downloaded", 0)
-                    except:
-                        return 0
-                return 0
-            
-            list = os.listdir(sprites_dir) 
-            spritecount = len(list) # count downloaded sprites
-            expected_sprite_count = load_counter() # pulls the sprite count
-            if spritecount == expected_sprite_count: #do we have all the sprites? check against sprite count
-                check_dict["sprites_dir"] = True
-
-        if os.path.exists(egg_file): #egg groups to modern english names
-            check_dict["egg_groups"] = True
-
-        return check_dict
+        # one manifest read and a few stats, and if something's off, the specific sprites that need fetching again
+        return check_cache(os.path.join(cache_dir, "manifest.json"))
 
 
 
     # data checks and downloads, from package, to show it's working and when it's ready
     def load_data(self):
         def task():
-            self.loading_label.after(0, lambda:self.loading_label.pack(pady=10))        
-            self.fetching_label.after(0, lambda:self.fetching_label.pack(pady=10))
+            self.events.call(lambda: self.loading_label.pack(pady=10))
+            self.events.call(lambda: self.fetching_label.pack(pady=10))
+            self.events.call(lambda: self.progress_bar.pack(pady=5))
             self.set_loading_message("Loading Pokémon data...")
-            if self.check_list["poke_file"]:  #if we have it, load it, but faster.
-                self.data = fetch_pokemon_data()
-                root.after(100)
+            if self.check_list["poke_file"]:  #if we have it, we only need to open it
+                time.sleep(0.1)
             else:  #if we don't have it, get it.
                 self.set_loading_message("Fetching Pokémon data...")
-                self.data = fetch_pokemon_data(status_callback=self.set_fetching_label)
-                root.after(300)
+                fetch_pokemon_data(status_callback=self.set_fetching_label, load=False,
+                                   show_error=lambda title, msg: self.events.call(messagebox.showerror, title, msg)) # dialogs belong on the Tk thread
+                time.sleep(0.3)
+            if self.use_sqlite: # sqlite backend, (re)built from professordata the first time
+                self.data = open_repository(status_callback=self.set_fetching_label)
+            else: # offset index: summaries in memory, full entries paged in when quizzed or sampled
+                self.data = open_lazy_data()
+            self.flavor_pool = FlavorPool(load_flavor_index(status_callback=self.set_fetching_label)) # rebuilt only if professordata changed
             self.set_loading_message("Loading sprites...")
             if self.check_list["sprites_dir"]:
-                root.after(100)
+                time.sleep(0.1)
             else: #if we don't have it, get it, find everything we're missing, give updates
                 self.set_loading_message("Fetching sprites...")
-                self.sprite_check = cache_sprites(status_callback=self.set_fetching_label)
-                root.after(300)
+                self.sprite_check = cache_sprites(status_callback=self.set_fetching_label, repo=self.data,
+                                                  only=self.check_list["repair_sprites"]) # None means check them all
+                time.sleep(0.3)
             self.set_loading_message("Loading egg group cache...")
             if self.check_list["egg_groups"]:
                 self.egg_group_cache = load_egg_group_cache()
-                root.after(100)
+                time.sleep(0.1)
             else:
                 self.set_loading_message("Fetching egg group cache...")
                 self.egg_group_cache = load_egg_group_cache()
-                root.after(300)
+                time.sleep(0.3)
+            update_manifest(self.data) # record what's on disk now, so the next start can skip all of the above
             self.set_loading_message("Loading Complete!")
-            root.after(200)
+            time.sleep(0.2)
 
             
-            self.loading_label.after(0, lambda: self.loading_label.pack_forget())  # Remove loading label when we're done
-            self.fetching_label.after(0, lambda: self.fetching_label.pack_forget()) # remove the fetching label now that it's done
+            self.events.call(self.loading_label.pack_forget)  # Remove loading label when we're done
+            self.events.call(self.fetching_label.pack_forget) # remove the fetching label now that it's done
+            self.events.call(self.progress_bar.pack_forget)
 
             self.cache_flag = True
-            self.ui.root.after(0, lambda: self.ui.update_cache_button(self.cache_flag))          
 
+            self.name_index = build_name_index(self.data) # built once here, start_quiz just looks names up
+            self.suggester = NameSuggester(self.name_index) # typo-tolerant search for autocomplete and "did you mean"
             self.all_pokemon = self.data # set a pool of comparative data, for pokedex entries, but could be used to generate a random mon to do taller/shorter, heavier/lighter or other comparisons.
+            # questions are generated once per Pokémon, start_quiz and the unit toggle just look them up
+            self.question_bank = QuestionBank(self.egg_group_cache, self.all_pokemon, flavor_pool=self.flavor_pool, rng=self.rng)
             self.current_pokemon = None
             self.current_question_index = 0
             self.score = 0
@@ -138,70 +145,37 @@ class ProfessorLocke:
             self.leniency = 0.15  # Numerical leniency in percentage
                 # String similarity threshold in percentage
             self.string_similarity_threshold = 0.7
-            self.ui.update_score(self.score, self.total_questions)
+            self.events.call(self.ui.update_score, self.score, self.total_questions)
+            self.events.call(self.ui.update_cache_button, self.cache_flag) # only once everything above is ready
 
         threading.Thread(target=task, daemon=True).start() # runs the load data function in a separate thread to avoid freezing the UI or holding it up so the labels will update
 #updates overall loading data status
     def set_loading_message(self, message: str):
-        self.loading_label.config(text="")
-        self.loading_label.update_idletasks()
-        self.loading_label.config(text=message)
-        self.loading_label.update_idletasks()
-        self.loading_label.after(0, lambda: self.loading_label.config(text=message))
+        self.events.post("loading", message) # safe from any thread
 #updates specific loading data status
     def set_fetching_label(self, msg: str):
-        self.fetching_label.config(text="")
-        self.fetching_label.update_idletasks()
-        self.fetching_label.config(text=msg)
-        self.fetching_label.update_idletasks()
-        self.fetching_label.after(0, lambda: self.fetching_label.config(text=msg))
+        self.events.post("fetching", msg)
 
     def start_quiz(self, pokemon_name: str):
         if not pokemon_name.strip():
             self.ui.show_feedback("Please enter a Pokemon name!", "red") # error if no name is entered
             return
+        if self.question_bank is None: # still loading, or reloading after a cache reset
+            self.ui.show_feedback("Still loading Pokémon data, try again in a moment!", "orange")
+            return
 
-        def normalize_pokemon_name(name: str) -> str:
-            """Normalize Pokémon name for searching."""
-            # Convert to lowercase and strip whitespace
-            name = name.lower().strip()
-            
-            # Handle regional variants in both formats: "Vulpix (Alola)" and "Vulpix Alola"
-            if '(' in name:
-                base, region = name.split('(')
-                base = base.strip()
-                region = region.strip(')').strip().lower()
-                return f"{base}-{region}"
-            elif ' ' in name:
-                parts = name.split()
-                if len(parts) == 2 and parts[1].lower() in ['alola', 'galar', 'hisui', 'paldea']:
-                    return f"{parts[0]}-{parts[1]}"
-            
-            # Remove special characters and extra spaces
-            name = re.sub(r'[^a-z0-9\s-]', '', name)
-            name = re.sub(r'\s+', ' ', name)
-            
-            return name
-
-        # Normalize the Pokémon name
-        normalized_name = normalize_pokemon_name(pokemon_name)
-        print(f"Searching for Pokemon: {normalized_name}")  # Debug log
-        
-        # Handle regional variant names in both formats; Vulpix (Alola) vs vulpix-alola
-            # First try direct match
-        self.current_pokemon = next(
-            (p for p in self.data if p['name'].lower() == normalized_name), None)
-        
-        # If not found, try to find the base form
-        if not self.current_pokemon:
-            # Split the name by hyphen to get the base name
-            base_name = normalized_name.split('-')[0]
-            # Find the first Pokémon that starts with the base name
-            self.current_pokemon = next(
-                (p for p in self.data if p['name'].lower().startswith(base_name)), None)
+        # one dict hit for exact names and aliases ("Vulpix (Alola)", "vulpix alola", "vulpix-alola"),
+        # then the prefix trie for the base form, so lookups don't scan self.data and always pick the same match
+        print(f"Searching for Pokemon: {name_key(pokemon_name)}")  # Debug log
+        self.current_pokemon = self.name_index.find(pokemon_name)
         
         if not self.current_pokemon: # If not found, show error, clear quiz frame (because of unknowable bugs that i don't want to solve), and reset the quiz
-            self.ui.show_feedback("Pokemon not found.", "orange")
+            close_names = [format_pokemon_name(n) for n in self.suggester.did_you_mean(pokemon_name)]
+            if close_names:
+                self.ui.show_feedback(f"Pokemon not found. Did you mean {', '.join(close_names)}?", "orange")
+                self.ui.show_suggestions(close_names) # click one to start it
+            else:
+                self.ui.show_feedback("Pokemon not found.", "orange")
             self.reset_quiz()
             return
         
@@ -212,11 +186,16 @@ class ProfessorLocke:
         # Reset quiz state
         self.reset_quiz()
 
-        self.questions = generate_questions(
-            self.current_pokemon, self.egg_group_cache, self.all_pokemon)
+        self.questions = self.question_bank.get(self.current_pokemon, self.use_metric)
 
         # Show the first question
         self.show_current_question()
+    # autocomplete for the search box, display names so they read nicely and still look up fine
+    def suggest_names(self, text: str):
+        suggester = self.suggester # None while (re)loading, read once so a cache reset can't pull it away mid-call
+        if not suggester:
+            return []
+        return [format_pokemon_name(n) for n in suggester.suggest(text)]
     # lol function because i'm using it in a few places and got lazy
     def reset_quiz(self):
         self.score = 0
@@ -240,10 +219,19 @@ class ProfessorLocke:
     def clear_cache(self):
         def clear():
             if self.cache_flag:
+                if self.data is not None:
+                    # drop everything that reads through the store before closing it; start_quiz and the
+                    # autocomplete wait for load_data to put new ones in place
+                    self.question_bank = None
+                    self.suggester = None
+                    self.name_index = None
+                    self.all_pokemon = None
+                    data, self.data = self.data, None
+                    data.close() # let go of professordata.db/.jsonl so they can be deleted
                 clearer.main(status_callback=self.set_loading_message)
                 self.cache_flag = False #says we don't have a cache, disabling the button
                 self.check_list = self.check_data(cache_dir) # Rebuild list of directories
-                root.after(100, self.load_data) # Reload data
+                self.events.call(self.load_data) # Reload data, kicked off from the main loop
             else:
                 print(f"no cache to clear")
         threading.Thread(target=clear, daemon=True).start() # threading to work easier.
@@ -305,19 +293,19 @@ class ProfessorLocke:
 
         # Show final grade if all questions are answered
         if len(self.answered_questions) == len(self.questions):
-            sprite_path = os.path.join("professor_cache", "sprites", f"{self.current_pokemon['name'].lower()}.png")
+            sprite_name = f"{self.current_pokemon['name'].lower()}.png" # key in the sprite pack
             self.ui.show_final_grade(
-                self.score, self.total_questions, sprite_path)
+                self.score, self.total_questions, sprite_name)
         else:
             self.show_current_question()
 
     def toggle_unit_system(self, use_metric: bool):
         """Toggle between metric and imperial units."""
         set_unit_system(use_metric)
-        # If we have a current quiz, regenerate questions with new units
-        if self.current_pokemon:
-            self.questions = generate_questions(
-                self.current_pokemon, self.egg_group_cache, self.all_pokemon)
+        self.use_metric = use_metric
+        # If we have a current quiz, swap in the answers for the new units, answers given so far stay put
+        if self.current_pokemon and self.questions:
+            self.question_bank.set_units(self.current_pokemon, self.questions, use_metric)
             self.show_current_question()
 
     
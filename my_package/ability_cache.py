@@ -0,0 +1,57 @@
+import json
+import os
+import threading
+from my_package.fetch_engine import SingleFlight
+from my_package.http_client import get_json
+from my_package.checkpoint import write_json_atomic
+
+# ability name -> english short effect, shared by every entry in the pipeline and kept between builds
+cache_dir = "professor_cache"
+ability_file = os.path.join(cache_dir, "abilities.json")
+API_BASE = "https://pokeapi.co/api/v2/"
+
+_effects = None # SingleFlight, so two threads asking for the same ability only fetch it once
+_lock = threading.Lock()
+
+
+def load_ability_cache() -> SingleFlight:
+    """Load saved ability effects from disk, once per process."""
+    global _effects
+    with _lock:
+        if _effects is None:
+            saved = {}
+            if os.path.exists(ability_file):
+                try:
+                    with open(ability_file, 'r') as f:
+                        saved = json.load(f)
+                except:
+                    saved = {}
+            _effects = SingleFlight(saved)
+        return _effects
+
+
+def save_ability_cache():
+    """Write the ability effects to disk (temp file + rename, so a crash can't leave half a file)."""
+    with _lock:
+        if _effects is None:
+            return
+    write_json_atomic(ability_file, _effects.snapshot())
+
+
+def fetch_ability_effect(ability_name):
+    """Fetch the short_effect of an ability by its name, straight from the API."""
+    ability_resp = get_json(API_BASE + f"ability/{ability_name}")
+    effect_entries = ability_resp.get("effect_entries", [])
+    for entry in effect_entries:
+        if entry.get("language", {}).get("name") == "en":  # Ensure it's in English
+            return entry.get("short_effect", "No effect description available.")
+    return "No effect description available."
+
+
+def get_ability_effect(ability_name):
+    """Return the short_effect of an ability, fetching it only if no one has yet."""
+    try:
+        return load_ability_cache().get(ability_name, fetch_ability_effect)
+    except Exception as e: # errors aren't cached, next build gets another go at it
+        print(f"Error fetching ability {ability_name}: {e}")
+        return "Error fetching effect."
@@ -0,0 +1,148 @@
+import io
+import os
+import shutil
+import threading
+import zipfile
+
+# the professor_cache.zip that ships with the repo, read in place: members are opened by name through the zip's
+# central directory, and only copied out into professor_cache when something needs a real (writeable) file
+cache_dir = "professor_cache"
+bundle_paths = ("professor_cache.zip", os.path.join(cache_dir, "professor_cache.zip")) # next to the app, or inside the cache
+SPRITES_PREFIX = "sprites/"
+NESTED_SPRITES = "sprites.zip" # older bundles keep (some of) the sprites in a zip inside the zip
+retired_file = os.path.join(cache_dir, "bundle_retired") # written by Reset Cache, the cache comes from the API after that
+
+
+class CacheBundle:
+    """Random-access reads out of a cache zip. Safe to share between threads."""
+    def __init__(self, path: str):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        self.members = set(self.zip.namelist())
+        self.nested = None # opened on the first sprite that isn't in sprites/
+        self.lock = threading.Lock()
+
+    def close(self):
+        with self.lock:
+            if self.nested is not None:
+                self.nested.close()
+                self.nested = None
+            self.zip.close()
+
+    def has(self, member: str) -> bool:
+        return member in self.members
+
+    def open(self, member: str):
+        """Binary file object for a member, decompressed as it's read."""
+        return self.zip.open(member)
+
+    def read(self, member: str):
+        """A member's bytes, or None if the bundle doesn't have it."""
+        if member not in self.members:
+            return None
+        with self.lock:
+            return self.zip.read(member)
+
+    def _nested(self):
+        with self.lock:
+            if self.nested is None and NESTED_SPRITES in self.members:
+                # a deflated zip can't be seeked into, so the inner one is read into memory once (about a megabyte)
+                self.nested = zipfile.ZipFile(io.BytesIO(self.zip.read(NESTED_SPRITES)))
+            return self.nested
+
+    def sprite(self, name: str):
+        """Bytes for a sprite like "bulbasaur.png", or None."""
+        data = self.read(SPRITES_PREFIX + name)
+        if data is None:
+            nested = self._nested()
+            if nested is not None and SPRITES_PREFIX + name in nested.NameToInfo:
+                with self.lock:
+                    data = nested.read(SPRITES_PREFIX + name)
+        return data
+
+    def sprite_names(self) -> set:
+        """Every sprite filename the bundle can serve."""
+        names = {m[len(SPRITES_PREFIX):] for m in self.members if m.startswith(SPRITES_PREFIX)}
+        nested = self._nested()
+        if nested is not None:
+            names.update(m[len(SPRITES_PREFIX):] for m in nested.namelist() if m.startswith(SPRITES_PREFIX))
+        names.discard("")
+        return names
+
+    def extract(self, member: str, dest: str) -> str:
+        """Copy one member out to dest (atomically), for callers that need a real file."""
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        tmp_path = dest + ".tmp"
+        with self.lock, self.zip.open(member) as src, open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, dest)
+        return dest
+
+
+_bundle = None
+_bundle_checked = False
+_bundle_lock = threading.Lock()
+
+
+def bundle_file():
+    """Path of the cache zip we'd read from, or None."""
+    for path in bundle_paths:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def get_bundle():
+    """The shared CacheBundle, opened on first use, or None if there's no (readable) cache zip."""
+    global _bundle, _bundle_checked
+    with _bundle_lock:
+        if not _bundle_checked:
+            _bundle_checked = True
+            path = bundle_file()
+            if path:
+                try:
+                    _bundle = CacheBundle(path)
+                except (OSError, zipfile.BadZipFile) as e:
+                    print(f"Could not open {path}: {e}")
+        return _bundle
+
+
+def close_bundle():
+    global _bundle, _bundle_checked
+    with _bundle_lock:
+        if _bundle is not None:
+            _bundle.close()
+        _bundle = None
+        _bundle_checked = False
+
+
+def bundle_retired() -> bool:
+    return os.path.exists(retired_file)
+
+
+def retire_bundle():
+    """Stop seeding the cache from the zip, so the next load rebuilds from the API instead of the zip's snapshot."""
+    os.makedirs(os.path.dirname(retired_file) or ".", exist_ok=True)
+    with open(retired_file, 'w') as f:
+        f.write("delete this file to read professordata, egg groups and sprites from professor_cache.zip again\n")
+
+
+def seed_bundle():
+    """The shared CacheBundle as a source of cache data (professordata, egg groups, sprites), or None once
+    Reset Cache retired it. Sounds don't come from the API, so cache_path keeps using the zip either way."""
+    return None if bundle_retired() else get_bundle()
+
+
+def bundle_has(member: str) -> bool:
+    bundle = seed_bundle()
+    return bundle is not None and bundle.has(member)
+
+
+def cache_path(filename: str, cache_dir: str = cache_dir) -> str:
+    """Path to filename in the cache folder, extracting it from the bundle first if that's the only copy
+    (winsound, for one, can only play real files asynchronously)."""
+    path = os.path.join(cache_dir, filename)
+    bundle = get_bundle()
+    if not os.path.exists(path) and bundle is not None and bundle.has(filename):
+        bundle.extract(filename, path)
+    return path
@@ -1,28 +1,55 @@
 import os
 import shutil
 import time
-import json
+from my_package.sprite_pack import close_reader
+from my_package.sprite_cacher import save_counter
+from my_package.cache_bundle import bundle_file, retire_bundle
+from my_package.progress import Progress
 
 # Identify the caches
 cache_dir = "professor_cache"
 sprites_dir = os.path.join(cache_dir, "sprites")
-poke_file = os.path.join(cache_dir, "professordata.json")
+poke_file = os.path.join(cache_dir, "professordata.jsonl")
+legacy_poke_file = os.path.join(cache_dir, "professordata.json")
+db_file = os.path.join(cache_dir, "professordata.db")
+index_file = os.path.join(cache_dir, "professordata.idx")
+flavor_file = os.path.join(cache_dir, "flavor_text.json")
+journal_file = os.path.join(cache_dir, "professordata.journal")
 egg_file = os.path.join(cache_dir, "egg_groups.json")
 counter_file = os.path.join(cache_dir, "utility.json")
+raw_dir = os.path.join(cache_dir, "raw")
+sprite_pack_file = os.path.join(cache_dir, "sprites.pack")
+sprite_index_file = os.path.join(cache_dir, "sprites.idx")
+render_pack_file = os.path.join(cache_dir, "sprite_renders.pack") # pre-rendered final grade sprites
+render_index_file = os.path.join(cache_dir, "sprite_renders.idx")
+manifest_file = os.path.join(cache_dir, "manifest.json")
 
 # Deletes the caches, displays a status update, and deletes.
+# the raw API responses in professor_cache/raw are left alone on purpose, the rebuild revalidates them instead of downloading everything again
 def main(status_callback):
-    clear_professordata(status_callback)
-    time.sleep(1)
-    clear_egg_cache(status_callback)
-    time.sleep(1)
-    clear_sprites(status_callback)
-    time.sleep(1)
-    clear_sprite_counter(status_callback)
-    time.sleep(1)
+    if os.path.exists(manifest_file): # describes the caches we're about to delete
+        os.remove(manifest_file)
+    if bundle_file(): # otherwise the reload would just restore professor_cache.zip's snapshot instead of asking the API
+        retire_bundle()
+    steps = (clear_professordata, clear_egg_cache, clear_sprites, clear_sprite_counter)
+    progress = Progress("Clearing cache", len(steps), status_callback)
+    for step in steps:
+        step(status_callback)
+        time.sleep(1)
+        progress.advance()
 
 # Find & delete professorcache
 def clear_professordata(status_callback):
+    if os.path.exists(journal_file): # a half-finished build shouldn't be resumed after a reset
+        os.remove(journal_file)
+    if os.path.exists(legacy_poke_file): # old format, would just get converted back on the next load
+        os.remove(legacy_poke_file)
+    if os.path.exists(db_file): # the sqlite copy, offset index and flavor text index are built from professordata, so they go too
+        os.remove(db_file)
+    if os.path.exists(index_file):
+        os.remove(index_file)
+    if os.path.exists(flavor_file):
+        os.remove(flavor_file)
     if os.path.exists(poke_file):
         os.remove(poke_file)
         msg = f"Pokémon cache cleared."
@@ -45,10 +72,18 @@ def clear_egg_cache(status_callback):
         if status_callback:
             status_callback(msg)
 
-# delete sprites
+# delete sprites: the pack is two files, plus any loose ones left from before it
 def clear_sprites(status_callback):
+    close_reader() # the ui keeps the pack mapped, windows won't delete it otherwise
+    found = False
+    for path in (sprite_index_file, sprite_pack_file, render_index_file, render_pack_file):
+        if os.path.exists(path):
+            os.remove(path)
+            found = True
     if os.path.exists(sprites_dir):
         shutil.rmtree(sprites_dir)
+        found = True
+    if found:
         msg = f"Sprites Cleared."
         if status_callback:
             status_callback(msg)
@@ -57,12 +92,23 @@ def clear_sprites(status_callback):
         if status_callback:
             status_callback(msg)
 
+# delete the raw API responses too, only for when you really want a from-scratch download
+def clear_raw_store(status_callback):
+    if os.path.exists(raw_dir):
+        shutil.rmtree(raw_dir)
+        msg = f"Raw API cache cleared."
+        if status_callback:
+            status_callback(msg)
+    else:
+        msg = f"Raw API cache not cleared."
+        if status_callback:
+            status_callback(msg)
+
 # reset sprite counter
 def clear_sprite_counter(status_callback):
     counter = {"total_downloaded": 0, "last_update": ""}
     try:
-        with open(counter_file, 'w') as f:
-            json.dump(counter, f)
+        save_counter(counter) # only the counter's keys, use_metric and use_sqlite live in utility.json too
         msg = f"Sprite counter reset."
         if status_callback:
             status_callback(msg)
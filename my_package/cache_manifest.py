@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+from my_package.data_store import data_exists, iter_pokemon
+from my_package.sprite_cacher import sprite_files
+from my_package.sprite_pack import SpritePack, read_index, index_path, pack_file
+from my_package.cache_bundle import seed_bundle, bundle_file, bundle_has, bundle_retired
+from my_package.checkpoint import write_json_atomic, file_stamp
+
+# one file describing every cache artifact (format version, size, mtime, sha256), so startup can tell the cache is
+# intact from one read and a few stats instead of listing and counting the sprites folder
+cache_dir = "professor_cache"
+manifest_file = os.path.join(cache_dir, "manifest.json")
+poke_file = os.path.join(cache_dir, "professordata.jsonl")
+egg_file = os.path.join(cache_dir, "egg_groups.json")
+MANIFEST_VERSION = 1
+ARTIFACT_VERSIONS = {"professordata.jsonl": 1, "egg_groups.json": 1, "sprites": 2, "bundle": 1} # bump when a format changes
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_record(path: str, version: int = 1, previous: dict = None):
+    """Manifest entry for a file; the old hash is reused when size and mtime haven't moved."""
+    stamp = file_stamp(path)
+    if stamp is None:
+        return None
+    if previous and previous.get("version") == version and _record_stamp(previous) == stamp:
+        return previous
+    return {"version": version, **stamp, "sha256": file_hash(path)}
+
+
+def _record_stamp(record: dict) -> dict:
+    return {"size": record.get("size"), "mtime_ns": record.get("mtime_ns")}
+
+
+def record_matches(path: str, record: dict, version: int) -> bool:
+    """Cheap check: same format version and the file's size and mtime are what we wrote down."""
+    return bool(record) and record.get("version") == version and file_stamp(path) == _record_stamp(record)
+
+
+def load_manifest(path: str = manifest_file):
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def save_manifest(manifest: dict, path: str = manifest_file):
+    write_json_atomic(path, manifest, separators=(",", ":"))
+
+
+def expected_sprites(repo=None) -> list:
+    """Every sprite filename professordata says we should have."""
+    if repo is not None:
+        entries = repo.sprite_entries()
+    elif data_exists(poke_file):
+        entries = iter_pokemon(poke_file)
+    else:
+        return []
+    return [filename for entry in entries for filename, _ in sprite_files(entry)]
+
+
+def update_manifest(repo=None, path: str = manifest_file) -> dict:
+    """Write down the current state of the cache. Only files whose size or mtime changed get hashed again."""
+    old = load_manifest(path) or {}
+    old_artifacts = old.get("artifacts", {})
+    old_sprites = old.get("sprites", {})
+    artifacts = {}
+    for name, file in (("professordata.jsonl", poke_file), ("egg_groups.json", egg_file), ("bundle", seeding_bundle_file())):
+        if file is None:
+            continue
+        record = file_record(file, ARTIFACT_VERSIONS[name], old_artifacts.get(name))
+        if record:
+            artifacts[name] = record
+    version = ARTIFACT_VERSIONS["sprites"]
+    pack_record = file_record(pack_file, version, old_sprites.get("pack"))
+    index_record = file_record(index_path(pack_file), version, old_sprites.get("index"))
+    if (old_sprites.get("version") == version and "missing" in old_sprites and index_record == old_sprites.get("index")
+            and all(artifacts.get(name) == old_artifacts.get(name) for name in ("professordata.jsonl", "bundle"))):
+        missing = old_sprites["missing"] # same data, same pack, same zip: same answer, without reading them all again
+    else:
+        packed = read_index(pack_file) # per-sprite checksums live in the pack index itself
+        bundled = _bundled_sprites()
+        missing = [filename for filename in expected_sprites(repo) if filename not in packed and filename not in bundled] # failed downloads, retried next start
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "artifacts": artifacts,
+        "sprites": {
+            "version": version,
+            "pack": pack_record,
+            "index": index_record,
+            "missing": missing,
+        },
+    }
+    save_manifest(manifest, path)
+    return manifest
+
+
+def seeding_bundle_file():
+    """The cache zip, if it still seeds the cache (Reset Cache retires it)."""
+    return None if bundle_retired() else bundle_file()
+
+
+def _bundled_sprites() -> set:
+    bundle = seed_bundle()
+    return bundle.sprite_names() if bundle is not None else set()
+
+
+def verify_sprites() -> set:
+    """Sprites that aren't in the pack or whose bytes fail their checksum. Streams professordata for the expected list,
+    so it only runs when the pack changed behind the manifest's back."""
+    pack = SpritePack(pack_file)
+    try:
+        packed = set(pack.names())
+        repair = pack.verify()
+    finally:
+        pack.close()
+    bundled = _bundled_sprites()
+    repair.update(filename for filename in expected_sprites() if filename not in packed and filename not in bundled)
+    return repair
+
+
+def check_cache(path: str = manifest_file) -> dict:
+    """What load_data needs to do. repair_sprites is the set of sprites to fetch, or None for a full pass."""
+    check = {"poke_file": data_exists(poke_file), "sprites_dir": False,
+             "egg_groups": os.path.exists(egg_file) or bundle_has("egg_groups.json"), "repair_sprites": None}
+    manifest = load_manifest(path)
+    if manifest is None or not check["poke_file"]:
+        return check # no manifest yet (or no data), fall back to cache_sprites checking every file
+    artifacts = manifest.get("artifacts", {})
+    if os.path.exists(egg_file) and not record_matches(egg_file, artifacts.get("egg_groups.json"), ARTIFACT_VERSIONS["egg_groups.json"]):
+        try: # changed since we last saw it, small enough to just make sure it still parses
+            with open(egg_file, 'r') as f:
+                json.load(f)
+        except (OSError, ValueError):
+            os.remove(egg_file)
+            check["egg_groups"] = False
+    if not record_matches(poke_file, artifacts.get("professordata.jsonl"), ARTIFACT_VERSIONS["professordata.jsonl"]):
+        return check # professordata was rebuilt, the list of sprites may have changed with it
+    bundle = seeding_bundle_file()
+    if bundle is None and "bundle" in artifacts or (
+            bundle is not None and not record_matches(bundle, artifacts.get("bundle"), ARTIFACT_VERSIONS["bundle"])):
+        return check # professor_cache.zip was added, swapped or removed, so were the sprites it serves
+    sprites = manifest.get("sprites", {})
+    if sprites.get("version") != ARTIFACT_VERSIONS["sprites"]:
+        return check
+    if (not sprites.get("missing") and record_matches(pack_file, sprites.get("pack"), sprites["version"])
+            and record_matches(index_path(pack_file), sprites.get("index"), sprites["version"])):
+        check["sprites_dir"] = True # pack and index are exactly as the manifest left them
+        check["repair_sprites"] = set()
+        return check
+    check["repair_sprites"] = verify_sprites()
+    check["sprites_dir"] = not check["repair_sprites"]
+    return check
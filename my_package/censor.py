@@ -0,0 +1,105 @@
+import re
+import threading
+from my_package.utils import get_base_name, censor_pokemon_names
+
+# censor_pokemon_names compiles a fresh regex for every entry; this compiles one matcher for every name at once,
+# built as a trie so it scans a pokedex entry in one pass no matter how many names it knows. flavor_index runs
+# it over every entry when professordata is written, so nothing gets censored (or compiled) while the app loads
+MASK = "***"
+SEPARATOR = r"[-\s.'’:]{0,2}" # a hyphen in a slug is written all sorts of ways: "Mr. Mime", "Tapu Koko", "Type: Null"
+SPELLINGS = { # the ones the slug can't be stretched into
+    "farfetchd": ["farfetch'd", "farfetch’d"],
+    "sirfetchd": ["sirfetch'd", "sirfetch’d"],
+    "nidoran-f": ["nidoran"],
+    "nidoran-m": ["nidoran"],
+    "flabebe": ["flabébé"],
+}
+
+
+def censor_terms(name: str) -> list:
+    """What censor_pokemon_names would hide for name: the name itself and its base name ("vulpix-alola" -> "vulpix"),
+    plus the spellings in SPELLINGS. Matching ignores case, so the title-cased copy it also adds isn't needed."""
+    name = name.lower()
+    base_name = get_base_name(name)
+    terms = [name] if base_name == name else [name, base_name]
+    return terms + [spelling for term in terms for spelling in SPELLINGS.get(term, ())]
+
+
+def trie_pattern(terms) -> str:
+    """One regex alternation for many words, shaped like a trie ("pichu|pikachu" -> "pi(?:chu|kachu)"), so matching
+    never retries a shared prefix. Longer words are tried first, so the longest whole word wins.
+    Hyphens match SEPARATOR, so "mr-mime" also hides "MR. MIME"."""
+    trie = {}
+    for term in terms:
+        if not term:
+            continue
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True # end of a word
+
+    def build(node) -> str:
+        ends = "" in node
+        branches = [(SEPARATOR if char == "-" else re.escape(char)) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            return "(?:" + body + ")?" # greedy: try the longer word, fall back to stopping here
+        return body
+
+    return build(trie)
+
+
+def compile_terms(terms):
+    return re.compile(r"\b(?:" + trie_pattern(terms) + r")\b", re.IGNORECASE)
+
+
+class CensorEngine:
+    """Redacts every known Pokémon name from text with one cached, compiled matcher."""
+    def __init__(self, names=()):
+        self.names = list(names)
+        self.combined = None # every known name, compiled on first censor_all
+        self.lock = threading.Lock()
+
+    def all_matcher(self):
+        if self.combined is None:
+            combined = compile_terms(term for name in self.names for term in censor_terms(name))
+            with self.lock:
+                self.combined = combined
+        return self.combined
+
+    def censor_all(self, text: str) -> str:
+        """Hide every known Pokémon name, not just the ones a question is about ("evolves from Pichu"), and the
+        spelled-out forms censor_pokemon_names misses ("Mr. Mime" for mr-mime)."""
+        return self.all_matcher().sub(MASK, text) if self.names else text
+
+
+if __name__ == "__main__":
+    # microbenchmark: python -m my_package.censor
+    import random
+    import timeit
+    from my_package.data_store import data_exists, iter_pokemon
+
+    if not data_exists():
+        raise SystemExit("No professordata to benchmark with, run the app or the generator first.")
+    entries = [(e["name"], e.get("flavor_text") or []) for e in iter_pokemon()]
+    names = [name for name, _ in entries]
+    rng = random.Random(0)
+    cases = []
+    for _ in range(2000):
+        name, texts = rng.choice(entries)
+        other, other_texts = rng.choice(entries)
+        if texts and other_texts:
+            cases.append((rng.choice(texts), [name]))
+            cases.append((rng.choice(other_texts), [name, other]))
+
+    engine = CensorEngine(names)
+    start = timeit.default_timer()
+    engine.all_matcher()
+    print(f"compile the combined matcher for {len(names)} names: {(timeit.default_timer() - start) * 1000:.0f} ms")
+
+    for label, func in (("censor_pokemon_names", lambda: [censor_pokemon_names(t, n) for t, n in cases]),
+                        ("CensorEngine.censor_all", lambda: [engine.censor_all(t) for t, _ in cases])):
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{label:<24} {best / len(cases) * 1e6:8.1f} us per entry")
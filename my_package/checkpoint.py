@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+
+# append-only journal of finished entries, so an interrupted build picks up where it left off instead of starting over,
+# plus the atomic write and file stamp helpers every cache file goes through
+cache_dir = "professor_cache"
+journal_file = os.path.join(cache_dir, "professordata.journal")
+
+
+class Journal:
+    """One json line per finished entry: {"kind": "pokemon" or "variant", "id": ..., "entry": {...}}."""
+    def __init__(self, path: str = journal_file):
+        self.path = path
+        self.done = {"pokemon": {}, "variant": {}}
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError: # a torn last line from a crash mid-write, that entry just gets fetched again
+                        continue
+                    self.done.setdefault(record["kind"], {})[record["id"]] = record["entry"]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def get(self, kind: str, id):
+        """The journaled entry for this id, or None if it still needs fetching."""
+        return self.done.get(kind, {}).get(id)
+
+    def count(self, kind: str) -> int:
+        return len(self.done.get(kind, {}))
+
+    def record(self, kind: str, id, entry):
+        """Append a finished entry and push it to disk before moving on."""
+        if not entry: # failures aren't journaled, the next run retries them
+            return
+        line = json.dumps({"kind": kind, "id": id, "entry": entry}) + "\n"
+        with self.lock:
+            self.done.setdefault(kind, {})[id] = entry
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    def discard(self):
+        """Close and delete the journal once the final file is safely written."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def write_bytes_atomic(path: str, data: bytes, tmp_file: str = None):
+    """Write bytes to a temp file next to path, then swap it in, so readers never see half a file.
+    Pass tmp_file when several threads may write the same path at once."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_file = tmp_file or path + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def write_json_atomic(path: str, data, **dump_kwargs):
+    """write_bytes_atomic for json."""
+    write_bytes_atomic(path, json.dumps(data, **dump_kwargs).encode("utf-8"))
+
+
+def file_stamp(path: str):
+    """{"size", "mtime_ns"} of a file, or None if it isn't there. Cheap way to tell a file changed under us."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
@@ -4,20 +4,23 @@ from typing import Dict, Tuple, Optional
 import requests
 from tkinter import messagebox
 import my_package.professorlockejsongenerator as generator
+from my_package.raw_store import save_raw_index
+from my_package.data_store import data_exists, load_pokemon
+from my_package.cache_bundle import bundle_has, seed_bundle
 import time
 #open or create pokemon json data
-def fetch_pokemon_data(cache_dir: str = "professor_cache", status_callback=None) -> Optional[Tuple[Dict, Dict]]:
-    """Fetch Pokemon Data from API and cache it."""
-    poke_file = os.path.join(cache_dir, "professordata.json")
+def fetch_pokemon_data(cache_dir: str = "professor_cache", status_callback=None, load: bool = True, show_error=messagebox.showerror) -> Optional[Tuple[Dict, Dict]]:
+    """Fetch Pokemon Data from API and cache it. With load=False it only makes sure the file exists, for the lazy loaders.
+    show_error(title, message) reports a failed fetch; from a worker thread, pass one that hands it to the Tk thread."""
+    poke_file = os.path.join(cache_dir, "professordata.jsonl")
 
-    # Check if cache exists and is valid
-    if os.path.exists(poke_file):
-            #print(f"professordata.json found!")
+    # Check if cache exists and is valid (an old professordata.json gets converted on the way in)
+    if data_exists(poke_file):
+            #print(f"professordata.jsonl found!")
             if status_callback:
-                status_callback(f"professordata.json found!")
+                status_callback(f"professordata.jsonl found!")
             time.sleep(.1)
-            with open(poke_file, 'r') as d:
-                return json.load(d)
+            return load_pokemon(poke_file) if load else None
 
 
     try:
@@ -25,16 +28,16 @@ def fetch_pokemon_data(cache_dir: str = "professor_cache", status_callback=None)
         generator.main(status_callback=status_callback)
     
     except requests.RequestException as e:
-        messagebox.showerror("Error", f"Failed to fetch Pokémon data: {e}")
+        msg = f"Failed to fetch Pokémon data: {e}"
+        show_error("Error", msg)
         if status_callback:
-            status_callback("Error", f"Failed to fetch Pokémon data: {e}")
+            status_callback(msg)
         time.sleep(2)
         return {}
 
     #verifies it worked, then reopens the file for use
-    if os.path.exists(poke_file):
-            with open(poke_file, 'r') as d:
-                return json.load(d)
+    if os.path.exists(poke_file) and load:
+            return load_pokemon(poke_file)
 
 #open or create egg group cache
 def load_egg_group_cache(cache_dir: str = "professor_cache", status_callback=None) -> dict:
@@ -48,29 +51,15 @@ def load_egg_group_cache(cache_dir: str = "professor_cache", status_callback=Non
         time.sleep(.1)
         with open(cache_file, 'r') as f:
             return json.load(f)
+    if bundle_has("egg_groups.json"): # read in place from professor_cache.zip, nothing to write
+        print(f"egg_groups.json found in {seed_bundle().path}!")
+        if status_callback:
+            status_callback(f"egg_groups.json found in {seed_bundle().path}!")
+        return json.loads(seed_bundle().read("egg_groups.json"))
     try:
-        response = requests.get("https://pokeapi.co/api/v2/egg-group")
-        response.raise_for_status()
-        egg_groups = response.json()['results']
-
-        egg_group_cache = {}
-        for group in egg_groups:
-            group_response = requests.get(group['url'])
-            group_response.raise_for_status()
-            group_data = group_response.json()
-
-            # Get English name from names array
-            english_name = next(
-                (name['name'] for name in group_data['names']
-                 if name['language']['name'] == 'en'),
-                group_data['name']
-            )
-            egg_group_cache[group_data['name']] = english_name
-
-        # Save to cache file
-        os.makedirs(cache_dir, exist_ok=True)
-        with open(cache_file, 'w') as f:
-            json.dump(egg_group_cache, f)
+        # normally the generator already wrote this next to professordata; this is for data built before it did
+        egg_group_cache = generator.collect_egg_groups(status_callback=status_callback, path=cache_file)
+        save_raw_index()
 
         return egg_group_cache
     except requests.RequestException as e:
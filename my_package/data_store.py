@@ -0,0 +1,169 @@
+import io
+import json
+import os
+import random
+from my_package.cache_bundle import bundle_has, seed_bundle
+
+# professordata is stored as JSON Lines: one compact Pokémon per line, so it can be written as entries finish
+# and read one at a time instead of parsing one giant pretty-printed list
+cache_dir = "professor_cache"
+poke_file = os.path.join(cache_dir, "professordata.jsonl")
+legacy_poke_file = os.path.join(cache_dir, "professordata.json") # the old single-list format, converted on first load
+
+
+def encode_record(entry: dict) -> str:
+    """Compact one-line json for an entry."""
+    return json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+
+
+class RecordWriter:
+    """Writes entries one per line to a temp file, and only swaps it in for the real file on close."""
+    def __init__(self, path: str = poke_file):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+
+    def write(self, entry: dict):
+        self.file.write(encode_record(entry) + "\n")
+        self.count += 1
+
+    def close(self):
+        """Finish the file and atomically replace the old one."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Throw away a half-written file, the old one stays as it was."""
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_pokemon(entries, path: str = poke_file) -> int:
+    """Write any iterable of entries as the new professordata file, returns how many were written."""
+    with RecordWriter(path) as writer:
+        for entry in entries:
+            writer.write(entry)
+    return writer.count
+
+
+def sample_other(pool: list, exclude_name: str, rng=random):
+    """A random name from pool that isn't exclude_name, or None. Rejection sampled, so no copy of the pool:
+    the stores' random_other, for the flavor text question."""
+    if not pool or pool == [exclude_name]:
+        return None
+    while True: # we almost never hit exclude_name
+        name = rng.choice(pool)
+        if name != exclude_name:
+            return name
+
+
+def iter_pokemon(path: str = poke_file):
+    """Yield entries one by one without loading the whole file."""
+    ensure_jsonl(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_pokemon(path: str = poke_file) -> list:
+    """Every entry as a list, for the callers that really do want it all in memory."""
+    return list(iter_pokemon(path))
+
+
+def legacy_path(path: str = poke_file) -> str:
+    """Where the old single-list file for a .jsonl path would be."""
+    return os.path.splitext(path)[0] + ".json"
+
+
+def data_exists(path: str = poke_file) -> bool:
+    """True if we have professordata in either format, or the cache zip has it."""
+    return os.path.exists(path) or os.path.exists(legacy_path(path)) or bundle_has(os.path.basename(legacy_path(path)))
+
+
+def iter_legacy_json(path: str = legacy_poke_file, chunk_size: int = 65536):
+    """Stream the entries out of an old professordata.json list without json.load-ing the whole thing."""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_legacy_stream(f, chunk_size, path)
+
+
+def iter_legacy_stream(f, chunk_size: int = 65536, path: str = legacy_poke_file):
+    """iter_legacy_json for an already open text stream, e.g. a member of the cache zip."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    eof = False
+    while not eof:
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+        while True:
+            buffer = buffer.lstrip()
+            if not started:
+                if not buffer:
+                    break
+                if buffer[0] != "[":
+                    raise ValueError(f"{path} is not a json list")
+                buffer = buffer[1:]
+                started = True
+                continue
+            if buffer[:1] == ",":
+                buffer = buffer[1:]
+                continue
+            if not buffer or buffer[0] == "]":
+                break
+            try:
+                entry, end = decoder.raw_decode(buffer)
+            except ValueError:
+                if eof:
+                    raise
+                break # entry is cut off at the chunk boundary, read more
+            yield entry
+            buffer = buffer[end:]
+
+
+def convert_json_to_jsonl(src: str = legacy_poke_file, dst: str = poke_file, remove_src: bool = True) -> int:
+    """Convert an old professordata.json into the JSON Lines format, returns how many entries were converted."""
+    count = write_pokemon(iter_legacy_json(src), dst)
+    if remove_src:
+        os.remove(src)
+    print(f"Converted {src} to {dst} ({count} entries)")
+    return count
+
+
+def ensure_jsonl(path: str = poke_file):
+    """If only the old format is around, convert it so readers can stream. That includes the copy in the cache zip,
+    which is converted straight out of the zip without extracting the json first."""
+    if os.path.exists(path):
+        return
+    if os.path.exists(legacy_path(path)):
+        convert_json_to_jsonl(legacy_path(path), path)
+        return
+    member = os.path.basename(legacy_path(path))
+    if bundle_has(member):
+        bundle = seed_bundle()
+        with io.TextIOWrapper(bundle.open(member), encoding='utf-8') as f:
+            count = write_pokemon(iter_legacy_stream(f, path=member), path)
+        print(f"Converted {member} from {bundle.path} to {path} ({count} entries)")
+
+
+if __name__ == "__main__":
+    import sys
+    # python -m my_package.data_store [old.json] [new.jsonl]
+    src = sys.argv[1] if len(sys.argv) > 1 else legacy_poke_file
+    dst = sys.argv[2] if len(sys.argv) > 2 else poke_file
+    convert_json_to_jsonl(src, dst, remove_src=False)
@@ -0,0 +1,141 @@
+import re
+from my_package.fetch_engine import SingleFlight
+from my_package.http_client import get_json
+
+# evolution chain id -> (species names, trigger descriptions). Every member of a line shares one chain,
+# so it gets fetched and parsed once per build instead of once per species (Eevee alone was nine-plus times)
+_chains = SingleFlight()
+
+
+def extract_chain_id_from_url(url):
+    match = re.search(r'/evolution-chain/(\d+)/', url)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def get_evolution_chain(evo_chain_url):
+    """Return (evolution_chain, evolution_chain_details) for a chain url, fetching and parsing each chain only once."""
+    chain_id = extract_chain_id_from_url(evo_chain_url) or evo_chain_url # fall back to the url if the id format ever changes
+
+    def load(chain_id): # on failure the error goes up to the entry fetch like before, and the next caller retries
+        evo_chain_data = get_json(evo_chain_url)
+        return extract_evolution_chain(evo_chain_data["chain"]), extract_evolution_chain_details(evo_chain_data["chain"])
+
+    evolution_chain, triggers = _chains.get(chain_id, load)
+    return list(evolution_chain), list(triggers) # copies, so no entry can edit another's lists
+
+
+def clear_evolution_cache():
+    """Forget every parsed chain, e.g. before a fresh build."""
+    _chains.clear()
+
+
+def extract_evolution_chain(chain):
+    evolutions = []
+    
+
+    def recurse(chain_link):
+        if chain_link:
+            evolutions.append(chain_link["species"]["name"])
+            for evo in chain_link.get("evolves_to", []):
+                    recurse(evo)
+    recurse(chain)
+    return evolutions
+
+def extract_evolution_chain_details(chain):
+    triggers = []
+    
+    def find_next_evolution(evolution_details):
+        if not evolution_details:
+            return
+        #ensures we're pulling for our pokemon in question         
+        current_species = evolution_details.get("species", {}).get("name", "unknown")
+        #separates evolution for current pokemon and evolution target, then proceeds through sorting that information for text entries
+        for evo in evolution_details.get("evolves_to", []):
+            evolution_data = evo.get("evolution_details", [])
+            evolves_to = evo.get("species", {}).get("name", "unknown")
+            
+            if evolution_data:
+                for detail in evolution_data:
+                    trigger_desc = f"{current_species} to {evolves_to}: "
+                    trigger_info = detail.get("trigger", {}).get("name", "unknown")
+
+                    # Base trigger
+                    trigger_desc += trigger_info
+                    
+                    # Level requirement
+                    if detail.get("min_level"):
+                        trigger_desc += f" at level {detail['min_level']}"
+                    
+                    # Item usage
+                    if detail.get("item"):
+                        item_name = detail["item"]["name"].replace("-", " ")
+                        trigger_desc = f"{current_species} to {evolves_to}: use a {item_name}"
+                    
+                    # Gender requirement
+                    if detail.get("gender") is not None:
+                        gender = "female" if detail["gender"] == 1 else "male"
+                        trigger_desc += f" ({gender} only)"
+                    
+                    # Held item
+                    if detail.get("held_item"):
+                        held_item_name = detail["held_item"]["name"].replace("-", " ")
+                        trigger_desc += f" while holding {held_item_name}"
+                    
+                    # Known move
+                    if detail.get("known_move"):
+                        trigger_desc += f" knowing {detail['known_move']['name']}"
+                    
+                    # Known move type
+                    if detail.get("known_move_type"):
+                        trigger_desc += f" knowing a {detail['known_move_type']['name']} move"
+                    
+                    # Location
+                    if detail.get("location"):
+                        location_name = detail["location"]["name"].replace("-", " ")
+                        trigger_desc += f" at {location_name}"
+                    
+                    # Affection/Beauty
+                    if detail.get("min_affection"):
+                        trigger_desc += f" with high affection"
+                    if detail.get("min_beauty"):
+                        trigger_desc += f" with high beauty"
+                    
+                    # Happiness
+                    if detail.get("min_happiness"):
+                        trigger_desc += f" with high happiness"
+                    
+                    # Weather
+                    if detail.get("needs_overworld_rain"):
+                        trigger_desc += " while raining"
+                    
+                    # Party requirements
+                    if detail.get("party_species"):
+                        trigger_desc += f" with {detail['party_species']['name']} in party"
+                    if detail.get("party_type"):
+                        trigger_desc += f" with a {detail['party_type']['name']} type in party"
+                    
+                    # Stats comparison
+                    if detail.get("relative_physical_stats") is not None:
+                        stat_relation = {-1: "higher Defense than Attack", 0: "equal Attack and Defense", 1: "higher Attack than Defense"}
+                        trigger_desc += f" with {stat_relation[detail['relative_physical_stats']]}"
+                    
+                    # Time of day
+                    if detail.get("time_of_day"):
+                        trigger_desc += f" during {detail['time_of_day']}"
+                    
+                    # Trade species
+                    if detail.get("trade_species"):
+                        trigger_desc += f" when traded for {detail['trade_species']['name']}"
+                    
+                    # Turn upside down
+                    if detail.get("turn_upside_down"):
+                        trigger_desc += " while holding console upside down"
+                    
+                    triggers.append(trigger_desc)
+
+            find_next_evolution(evo)
+                
+    find_next_evolution(chain)
+    return triggers
@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from my_package.progress import Progress
+
+# shared knobs for every bulk fetch; be nice to PokeAPI, it's free
+REQUESTS_PER_SECOND = 10 # global cap across every worker thread, not per worker
+BURST = 10 # how many requests can go out back to back before the bucket makes us wait
+MAX_WORKERS = 8 # entries processed at the same time
+
+
+class TokenBucket:
+    """Thread-safe token bucket, refills at `rate` tokens per second up to `capacity`."""
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait) # sleep outside the lock so other threads can check in
+
+
+# one bucket for the whole process, so the generator and variant script share the same budget
+limiter = TokenBucket(REQUESTS_PER_SECOND, BURST)
+
+
+def fetch_all(fetch_func, items: list, label: str = "Pokémon ID", status_callback=None, max_workers: int = MAX_WORKERS, on_result=None) -> list:
+    """Run fetch_func over items on a thread pool, returning results in the same order as items.
+    on_result(item, result) is called from the worker as soon as each item finishes, e.g. for checkpointing."""
+    total = len(items)
+    if total == 0:
+        return []
+    results = [None] * total
+    progress = Progress(f"Fetching {label}", total, status_callback) # throughput, retries and ETA instead of a line per item
+
+    def run(index, item):
+        results[index] = fetch_func(item)
+        if on_result:
+            on_result(item, results[index])
+        progress.advance() # completion order is random, so count instead of using the index
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run, index, item) for index, item in enumerate(items)]
+        for future in futures:
+            future.result() # re-raises anything fetch_func didn't handle itself
+    progress.finish()
+    return results
+
+
+class SingleFlight:
+    """Thread-safe memo: the first caller for a key runs the loader, anyone asking for the same key meanwhile
+    waits for that result instead of fetching it again. Failed loads aren't cached, the next caller retries."""
+    def __init__(self, values: dict = None):
+        self.values = values if values is not None else {}
+        self.lock = threading.Lock()
+        self.in_flight = {} # key -> Event
+
+    def get(self, key, loader):
+        while True:
+            with self.lock:
+                if key in self.values:
+                    return self.values[key]
+                event = self.in_flight.get(key)
+                if event is None: # we're the first to ask, so we do the load
+                    event = threading.Event()
+                    self.in_flight[key] = event
+                    break
+            event.wait() # someone else is loading it; loop back and read their result (or take over if it failed)
+
+        try:
+            value = loader(key)
+            with self.lock:
+                self.values[key] = value
+            return value
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            event.set()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return dict(self.values)
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
@@ -0,0 +1,87 @@
+import json
+import os
+import random
+import re
+from collections import Counter
+from my_package.censor import CensorEngine
+from my_package.checkpoint import write_json_atomic, file_stamp
+from my_package.data_store import poke_file, iter_pokemon
+
+# every pokedex entry cleaned up and censored once, when professordata is written, so the flavor text question
+# just picks a finished string. all species are masked, not only the quizzed one: "evolves from Pichu" gave it away
+INDEX_VERSION = 3
+flavor_file = os.path.join(os.path.dirname(poke_file), "flavor_text.json")
+
+
+def clean_flavor_text(text: str) -> str:
+    """One line of plain text: game line breaks and form feeds become spaces, words split with a soft hyphen
+    ("sun\\xad\\nlight") are joined back up, and a real hyphen at a line break ("bluish-\\nwhite") keeps its hyphen."""
+    text = re.sub(r"\xad\s*", "", text)
+    text = re.sub(r"-[\n\f]+", "-", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def build_flavor_index(entries, path: str = flavor_file, source: str = poke_file) -> dict:
+    """Clean, dedupe and censor every entry's flavor text, and write it next to professordata, stamped with the
+    professordata it came from. Returns {"entries": {name: [censored texts]}, "species": {name: species}, ...}."""
+    flavor = []
+    names = {} # every pokemon slug, plus every species in an evolution chain ("mimikyu" for mimikyu-disguised)
+    base_of = {} # variety id -> the base entry that fetched it
+    for entry in entries:
+        flavor.append((entry["name"], entry.get("id"), entry.get("flavor_text") or []))
+        names[entry["name"]] = None
+        names.update(dict.fromkeys(entry.get("evolution_chain") or []))
+        for variant_id in entry.get("fetched_variants") or []:
+            base_of.setdefault(variant_id, entry["name"])
+    engine = CensorEngine(names) # only the combined matcher gets compiled
+    entries_index = {}
+    species = {} # varieties share their species' pokedex entries, so the pool has to tell them apart
+    for name, id, texts in flavor:
+        cleaned = list(dict.fromkeys(clean_flavor_text(text) for text in texts)) # the same entry often differs only in line breaks
+        entries_index[name] = [engine.censor_all(text) for text in cleaned if text]
+        species[name] = base_of.get(id, name)
+    index = {"version": INDEX_VERSION, "source": file_stamp(source), "entries": entries_index, "species": species}
+    write_json_atomic(path, index, separators=(",", ":"))
+    return index
+
+
+def load_flavor_index(path: str = flavor_file, source: str = poke_file, status_callback=None) -> dict:
+    """The censored flavor text index (see build_flavor_index), rebuilt from professordata if it's missing or
+    professordata changed since."""
+    try:
+        with open(path, 'r') as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION and index.get("source") == file_stamp(source):
+            return index
+    except (OSError, ValueError):
+        pass
+    if status_callback:
+        status_callback("Building flavor text index...")
+    return build_flavor_index(iter_pokemon(source), path, source)
+
+
+class FlavorPool:
+    """The flavor text question's picks in O(1): every name that has flavor text, in a list to sample from.
+    Takes load_flavor_index()'s index."""
+    def __init__(self, index: dict):
+        self.index = index["entries"]
+        self.species = index.get("species", {})
+        self.names = [name for name, texts in self.index.items() if texts]
+        self.species_counts = Counter(self.species_of(name) for name in self.names)
+
+    def species_of(self, name: str) -> str:
+        return self.species.get(name, name)
+
+    def texts(self, name: str) -> list:
+        return self.index.get(name, [])
+
+    def other(self, exclude_name: str, rng=random):
+        """(name, censored text) for a random Pokémon of another species than exclude_name (lycanroc-dusk would
+        show lycanroc-midday's own entries), or None if there's no other one."""
+        exclude = self.species_of(exclude_name)
+        if self.species_counts.get(exclude, 0) == len(self.names):
+            return None
+        while True: # rejection sample, we almost never hit exclude_name's species
+            name = rng.choice(self.names)
+            if self.species_of(name) != exclude:
+                return name, rng.choice(self.index[name])
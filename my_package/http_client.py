@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from my_package.fetch_engine import limiter, MAX_WORKERS
+import my_package.raw_store as raw_store
+
+# one transport for every PokeAPI/sprite call in my_package; go through get/get_json/get_content, not requests.get
+TIMEOUT = (5, 30) # (connect, read) seconds
+MAX_RETRIES = 5 # attempts after the first one
+BACKOFF_BASE = 0.5 # seconds, doubled every retry
+BACKOFF_MAX = 30 # never wait longer than this between attempts, Retry-After included
+RETRY_STATUSES = {429, 500, 502, 503, 504} # transient stuff worth trying again
+OFFLINE = os.environ.get("PROFESSOR_OFFLINE") == "1" # serve json only from professor_cache/raw, never touch the network
+
+_session = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "retries": 0, "failures": 0, "not_modified": 0, "offline_hits": 0, "bytes": 0}
+
+
+def set_offline(offline: bool):
+    """Turn offline mode on or off (True means json comes only from the raw store)."""
+    global OFFLINE
+    OFFLINE = offline
+
+
+def get_session() -> requests.Session:
+    """Return the shared keep-alive session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # one pool per host, big enough that every worker thread can hold a connection open
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS * 2)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": "Professorlocke"})
+            _session = session
+        return _session
+
+
+def _count(key: str, amount: int = 1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def _retry_after(response) -> float:
+    """Seconds the server asked us to wait, or None if it didn't say."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try: # can also be an http date
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int, response=None) -> float:
+    wait = BACKOFF_BASE * (2 ** attempt)
+    if response is not None:
+        server_wait = _retry_after(response)
+        if server_wait is not None:
+            wait = server_wait
+    return min(wait, BACKOFF_MAX)
+
+
+def get(url: str, headers: dict = None) -> requests.Response:
+    """GET through the shared session with rate limiting, timeouts and retries. Raises requests.RequestException when it gives up."""
+    session = get_session()
+    attempt = 0
+    while True:
+        limiter.acquire() # every attempt counts against the global budget, retries included
+        _count("requests")
+        try:
+            response = session.get(url, headers=headers, timeout=TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= MAX_RETRIES:
+                _count("failures")
+                raise
+            wait = _backoff(attempt)
+            print(f"Retrying {url} in {wait:.1f}s ({e})")
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+                if not response.ok:
+                    _count("failures")
+                response.raise_for_status()
+                _count("bytes", len(response.content)) # body downloaded, for the progress readout
+                return response
+            wait = _backoff(attempt, response)
+            print(f"Retrying {url} in {wait:.1f}s (HTTP {response.status_code})")
+            response.close()
+        _count("retries")
+        attempt += 1
+        time.sleep(wait)
+
+
+def get_json(url: str):
+    """GET a url and return the decoded json body, revalidating against the raw store when we have a copy."""
+    meta = raw_store.lookup(url)
+    body = raw_store.read_body(meta) if meta else None
+    if OFFLINE:
+        if body is None:
+            raise requests.ConnectionError(f"Offline and {url} isn't in the raw store")
+        _count("offline_hits")
+        return json.loads(body)
+
+    headers = {}
+    if body is not None: # only ask "has it changed?" if we can actually reuse our copy
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    response = get(url, headers=headers or None)
+    if response.status_code == 304:
+        _count("not_modified")
+        return json.loads(body)
+    raw_store.store(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return response.json()
+
+
+def get_content(url: str) -> bytes:
+    """GET a url and return the raw bytes, for sprites and the like."""
+    return get(url).content
+
+
+def get_counters() -> dict:
+    """Just the request counters (requests, retries, failures, bytes...), cheap enough to poll for progress."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def get_stats() -> dict:
+    """Counters for the shared session: requests sent, retries, failures, 304s/offline reads, and connections opened vs reused."""
+    stats = get_counters()
+    opened = sent = 0
+    if _session is not None:
+        adapters = {id(a): a for a in _session.adapters.values()} # same adapter is mounted for http and https
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    sent += pool.num_requests
+    stats["connections_opened"] = opened
+    stats["connections_reused"] = max(0, sent - opened)
+    return stats
@@ -0,0 +1,120 @@
+import json
+import mmap
+import os
+import random
+import threading
+from collections import OrderedDict
+from my_package.data_store import poke_file, ensure_jsonl, sample_other
+from my_package.checkpoint import write_json_atomic, file_stamp
+
+# startup loader: only a small summary of each Pokémon stays in memory, the full entry (flavor text and all)
+# is read straight out of professordata.jsonl by byte offset when it's quizzed or sampled
+INDEX_VERSION = 1
+RECORD_CACHE_SIZE = 64 # full entries kept around after being paged in
+
+
+def index_path(path: str = poke_file) -> str:
+    return os.path.splitext(path)[0] + ".idx"
+
+
+def summarize(entry: dict) -> list:
+    """The resident part of an entry: [id, name, has_flavor_text]."""
+    return [entry.get("id"), entry.get("name"), bool(entry.get("flavor_text"))]
+
+
+def build_index(path: str = poke_file) -> dict:
+    """Scan the json lines once, noting where each entry starts and how long it is, plus its summary."""
+    entries = []
+    with open(path, 'rb') as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                entries.append([offset, len(line)] + summarize(json.loads(line)))
+            offset += len(line)
+    index = {"version": INDEX_VERSION, "source": file_stamp(path), "entries": entries}
+    write_json_atomic(index_path(path), index, separators=(",", ":"))
+    return index
+
+
+def load_index(path: str = poke_file) -> dict:
+    """Read the sidecar index, rebuilding it if it's missing or the data file changed since."""
+    try:
+        with open(index_path(path), 'r') as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION and index.get("source") == file_stamp(path):
+            return index
+    except (OSError, ValueError):
+        pass
+    return build_index(path)
+
+
+class LazyPokemonData:
+    """Read-only view of professordata with the same query methods as sqlite_store.PokemonRepository."""
+    def __init__(self, path: str = poke_file):
+        ensure_jsonl(path)
+        index = load_index(path)
+        self.path = path
+        self.offsets = {} # name -> (offset, length)
+        self.summaries = [] # [id, name, has_flavor_text] in file order
+        for offset, length, id, name, has_flavor_text in index["entries"]:
+            self.offsets[name] = (offset, length)
+            self.summaries.append((id, name, has_flavor_text))
+        self.by_id = {id: name for id, name, _ in self.summaries}
+        self.with_flavor_text = [name for _, name, has_flavor_text in self.summaries if has_flavor_text]
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else None
+        self.cache = OrderedDict() # name -> full entry, least recently used first
+        self.lock = threading.Lock()
+
+    def close(self):
+        """Let go of the file (Windows won't delete it while it's mapped)."""
+        with self.lock:
+            if self.map is not None:
+                self.map.close()
+                self.map = None
+            self.file.close()
+
+    def __len__(self):
+        return len(self.summaries)
+
+    def __iter__(self):
+        for _, name, _ in self.summaries:
+            yield self.get(name)
+
+    def names(self) -> list:
+        return [name for _, name, _ in self.summaries]
+
+    def get(self, name: str):
+        """The full entry for an exact name, paged in from the file, or None."""
+        with self.lock:
+            if name in self.cache:
+                self.cache.move_to_end(name)
+                return self.cache[name]
+            if name not in self.offsets:
+                return None
+            offset, length = self.offsets[name]
+            entry = json.loads(self.map[offset:offset + length])
+            self.cache[name] = entry
+            if len(self.cache) > RECORD_CACHE_SIZE:
+                self.cache.popitem(last=False)
+            return entry
+
+    def get_by_id(self, id: int):
+        name = self.by_id.get(id)
+        return self.get(name) if name else None
+
+    def random_other(self, exclude_name: str, with_flavor_text: bool = True, rng=random):
+        """A random entry that isn't exclude_name, by default only from ones that have flavor text."""
+        name = sample_other(self.with_flavor_text if with_flavor_text else self.names(), exclude_name, rng)
+        return self.get(name) if name else None
+
+    def sprite_entries(self):
+        """Just the fields cache_sprites needs, streamed without filling the record cache."""
+        for _, name, _ in self.summaries:
+            offset, length = self.offsets[name]
+            entry = json.loads(self.map[offset:offset + length])
+            yield {k: entry.get(k) for k in ("name", "sprite_url", "forms", "form_sprite_url")}
+
+
+def open_lazy_data(path: str = poke_file) -> LazyPokemonData:
+    return LazyPokemonData(path)
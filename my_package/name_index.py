@@ -0,0 +1,109 @@
+import bisect
+import re
+import unicodedata
+
+# name lookups for start_quiz: one dict for exact matches plus a prefix trie for the base-form fallback,
+# both built once at load time so a search costs the same whether there are 10 Pokémon or 10,000
+TOP_K = 8 # completions kept on every trie node, for autocomplete
+
+
+def name_key(name: str) -> str:
+    """Canonical lookup key: "Vulpix (Alola)", "vulpix alola" and "vulpix-alola" all become "vulpix-alola"."""
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower().strip() # flabébé -> flabebe
+    name = name.replace('♀', '-f').replace('♂', '-m')
+    name = re.sub(r"[.'’:]", '', name) # mr. mime, farfetch'd, type: null
+    name = re.sub(r'[()\s_]+', '-', name)
+    return re.sub(r'-+', '-', name).strip('-')
+
+
+class TrieNode:
+    __slots__ = ("children", "top", "first")
+
+    def __init__(self):
+        self.children = {}
+        self.top = [] # up to TOP_K (length, order, name) completions under this node, best first
+        self.first = None # earliest name under this node in file order, for the base-form fallback
+
+
+class NameIndex:
+    """Exact key -> name dict plus a prefix trie, with fetch(name) -> record to hand back the actual entry."""
+    def __init__(self, names, fetch):
+        self.fetch = fetch
+        self.exact = {}
+        self.root = TrieNode()
+        names = list(names)
+        self.names = names
+        for order, name in enumerate(names):
+            key = name_key(name)
+            self.exact.setdefault(key, name) # first one in file order wins, like the old scan
+            self._insert(key, (len(key), order, name))
+        for name in names: # aliases after every real name, so an alias can never shadow one
+            self.add_alias(name_key(name).replace('-', ''), name) # "mrmime", "hooh"
+
+    @classmethod
+    def from_records(cls, records: list):
+        by_name = {p['name']: p for p in records}
+        return cls((p['name'] for p in records), by_name.get)
+
+    @classmethod
+    def from_repository(cls, repo):
+        return cls(repo.names(), repo.get)
+
+    def add_alias(self, alias: str, name: str):
+        """Extra spelling that should find name (ignored if it already means something else)."""
+        self.exact.setdefault(name_key(alias), name)
+
+    def _insert(self, key: str, candidate):
+        node = self.root
+        for char in key + "$": # "$" just to land on the node for the full key too
+            if len(node.top) < TOP_K or candidate < node.top[-1]: # shortest name wins, then file order
+                bisect.insort(node.top, candidate)
+                del node.top[TOP_K:]
+            if node.first is None: # names go in in file order, so the first one stays
+                node.first = candidate[2]
+            if char != "$":
+                node = node.children.setdefault(char, TrieNode())
+
+    def _node(self, prefix: str):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def complete(self, prefix: str):
+        """Earliest name in file order starting with prefix, or None. Walks len(prefix) nodes.
+        Base entries come before their varieties, so "deoxys" finds the default form, not deoxys-speed."""
+        node = self._node(prefix)
+        return node.first if node else None
+
+    def completions(self, prefix: str, k: int = TOP_K) -> list:
+        """Up to k names starting with prefix, best first."""
+        node = self._node(name_key(prefix))
+        return [name for _, _, name in node.top[:k]] if node else []
+
+    def find_name(self, query: str):
+        """Exact match first, then the base form, then the best completion of the base name."""
+        key = name_key(query)
+        if not key:
+            return None
+        if key in self.exact:
+            return self.exact[key]
+        base_key = key.split('-')[0]
+        if base_key in self.exact: # "pikachu-whatever" -> pikachu
+            return self.exact[base_key]
+        return self.complete(base_key) # "aegislash" -> aegislash-shield, the default form
+
+    def find(self, query: str):
+        """The record for query, or None."""
+        name = self.find_name(query)
+        return self.fetch(name) if name else None
+
+
+def build_name_index(data) -> NameIndex:
+    """Index either the plain list of entries or a sqlite_store.PokemonRepository."""
+    if hasattr(data, "names"):
+        return NameIndex.from_repository(data)
+    return NameIndex.from_records(data)
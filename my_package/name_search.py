@@ -0,0 +1,87 @@
+import heapq
+from collections import Counter
+from my_package.name_index import name_key
+
+# typo-tolerant name search: a trigram index narrows ~1,400 names down to a handful of candidates,
+# and only those get a real edit distance, so a search stays well under a millisecond
+CANDIDATES = 12 # how many trigram hits get the full edit distance check
+
+
+def trigrams(key: str) -> set:
+    padded = f"  {key} " # padding so the start of a name counts for more, that's where people type correctly
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int = None) -> int:
+    """Levenshtein distance. With a limit it gives up early and returns limit + 1 once it's clearly over."""
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyNameIndex:
+    """Trigram postings over name keys; search() returns the k closest names."""
+    def __init__(self, names):
+        self.names = [] # position -> name
+        self.keys = [] # position -> name_key(name)
+        self.postings = {} # trigram -> positions that contain it
+        for name in names:
+            key = name_key(name)
+            position = len(self.names)
+            self.names.append(name)
+            self.keys.append(key)
+            for gram in trigrams(key):
+                self.postings.setdefault(gram, []).append(position)
+
+    def search(self, query: str, k: int = 5, max_distance: int = None) -> list:
+        """Up to k names closest to query, best first. Ties go to the earlier name, so results are stable."""
+        key = name_key(query)
+        if not key:
+            return []
+        counts = Counter()
+        for gram in trigrams(key):
+            counts.update(self.postings.get(gram, ()))
+        if not counts:
+            return []
+        candidates = heapq.nsmallest(CANDIDATES, counts, key=lambda p: (-counts[p], p))
+        if max_distance is None:
+            max_distance = max(1, len(key) // 3) # about one typo per three letters
+        scored = []
+        for position in candidates:
+            distance = edit_distance(key, self.keys[position], max_distance)
+            if distance <= max_distance:
+                scored.append((distance, position))
+        scored.sort()
+        return [self.names[position] for _, position in scored[:k]]
+
+
+class NameSuggester:
+    """Autocomplete and "did you mean" on top of a NameIndex: prefix completions first, then fuzzy matches."""
+    def __init__(self, name_index):
+        self.name_index = name_index
+        self.fuzzy = FuzzyNameIndex(name_index.names)
+
+    def suggest(self, query: str, k: int = 5) -> list:
+        """What to show while typing: names starting with query, topped up with near misses."""
+        results = self.name_index.completions(query, k)
+        if len(results) < k:
+            for name in self.fuzzy.search(query, k):
+                if name not in results:
+                    results.append(name)
+                    if len(results) == k:
+                        break
+        return results
+
+    def did_you_mean(self, query: str, k: int = 3) -> list:
+        """Closest names to a search that found nothing."""
+        return self.fuzzy.search(query, k)
@@ -3,167 +3,268 @@ import json
 import time
 import os
 import re
+import copy
 import tkinter as tk
 from tkinter import ttk
-import my_package.regional_variant_script as variant
+from my_package.fetch_engine import fetch_all, SingleFlight
+from my_package.ability_cache import get_ability_effect, load_ability_cache, save_ability_cache
+from my_package.evolution_cache import get_evolution_chain, clear_evolution_cache, extract_evolution_chain, extract_evolution_chain_details
+from my_package.http_client import get_json, get_stats, set_offline
+from my_package.raw_store import save_raw_index
+from my_package.checkpoint import Journal, write_json_atomic
+from my_package.data_store import poke_file, data_exists, load_pokemon, write_pokemon
+from my_package.flavor_index import build_flavor_index
 
 
-POKEMON_COUNT = 1025 # Current mon number, adjust if there's more in the future lmao
+POKEMON_COUNT = 1025 # Fallback mon number, only used if the API can't tell us the current count
 API_BASE = "https://pokeapi.co/api/v2/"
+egg_group_file = os.path.join(os.path.dirname(poke_file), "egg_groups.json") # english egg group names, kept next to professordata
 
 
-def get_pokemon_entry(id, status_callback=None):  # Go catch them mons, fetch them all (data that is)
-    try:  # I love error handling
-        pokemon_resp = requests.get(API_BASE + f"pokemon/{id}").json() #pokemon file
-        species_resp = requests.get(API_BASE + f"pokemon-species/{id}").json() #pokemon species file
-
-        #fetch namme
-        name = pokemon_resp["name"]
-        #fetch genus
-        genus = []
-        for gen in species_resp["genera"]:
-            if gen.get("language", {}).get("name") == "en":  # Ensure it's in English
-                genus.append(gen["genus"])
-        #fetch types
-        types = [t["type"]["name"] for t in pokemon_resp["types"]]
-    
-        #fetch stats and effort values
-        stats = {}
-        effort_values = {}
-        for stat in pokemon_resp["stats"]:
-            stat_name = stat["stat"]["name"]
-            base_stat = stat["base_stat"]
-            effort = stat["effort"]
-            stats[stat_name] = base_stat
-            if effort != 0:
-                effort_values[stat_name] = effort
-
-        #fetch catch rate
-        catch_rate = species_resp["capture_rate"]
-
-        #fetch base happiness
-
-        base_happiness = species_resp["base_happiness"]
-
-        #fetch all abilities
-        abilities = []
-        for a in pokemon_resp["abilities"]:
-            ability_name = a["ability"]["name"]
-            ability_effect = get_ability_effect(ability_name)
-            abilities.append({
-                "name": ability_name,
-                "short_effect": ability_effect
-            })
+UNWANTED_VARIANTS = [
+    "-gmax",
+    "-totem",
+    "-cap",
+    "-belle",
+    "-libre",
+    "-cosplay",
+    "-phd",
+    "-pop-star",
+    "-rock-star",
+    "-ash",
+    "-small",
+    "-large",
+    "-super",
+    "-starter"
+    ] # add varieties you don't want to see here, such as -mega or -alola (or whatever region)
+
+GENUS_OVERRIDES = {
+    "ponyta-galar": ["Unique Horn Pok\u00e9mon"],
+    "rapidash-galar": ["Unique Horn Pok\u00e9mon"], 
+    "growlithe-hisui": ["Scout Pok\u00e9mon"], 
+    "voltorb-hisui": ["Sphere Pok\u00e9mon"], 
+    "electrode-hisui": ["Sphere Pok\u00e9mon"], 
+    "mr-mime-galar": ["Dancing Pok\u00e9mon"], 
+    "articuno-galar": ["Cruel Pok\u00e9mon"], 
+    "zapdos-galar": ["Strong Legs Pok\u00e9mon"], 
+    "moltres-galar": ["Malevolent Pok\u00e9mon"],
+    "typholosion-hisui": ["Ghost Flame Pok\u00e9mon"],
+    "wooper-paldea": ["Mud Fish Pok\u00e9mon"],
+    "slowking-galar": ["Hexpert Pok\u00e9mon"],
+    "lilligant-hisui": ["Spinning Pok\u00e9mon"],
+    "darumanitan-galar": ["Zen Charm Pok\u00e9mon"],
+    "zorua-hisui": ["Spiteful Fox Pok\u00e9mon"],
+    "zoroark-hisui": ["Baneful Fox Pok\u00e9mon"],
+    "braviary-hisui": ["Battle Cry Pok\u00e9mon"],
+    "sliggoo-hisui": ["Snail Pok\u00e9mon"],
+    "goodra-hisui": ["Shell Bunker Pok\u00e9mon"]
+} #so genuses are encoded at the species level in the API. This fixes the few bugs as a result.
+# If new regions add new regional forms that use the same species but have different genuses, you'll need to manually add them.
+
+# the json build: key order for each kind of entry. If you pull more data from a pokemon, write an extractor
+# below and add its key here (and to VARIANT_FIELDS too if varieties should get it)
+BASE_FIELDS = [
+    "id", "name", "genus", "capture_rate", "base_happiness", "flavor_text", "versions", "stats", "effort_values",
+    "types", "abilities", "height", "weight", "egg_groups", "held_items", "evolution_chain", "evolution_chain_details",
+    "sprite_url", "form_sprite_url", "forms", "variants", "fetched_variants", "fetched_at"
+]
+# no forms or variants here, as they should be covered by the base entry. If we come to needing it, add the keys, but stuff will get real dicey
+VARIANT_FIELDS = [
+    "id", "name", "genus", "flavor_text", "versions", "stats", "types", "abilities", "height", "weight",
+    "egg_groups", "held_items", "evolution_chain", "evolution_chain_details", "sprite_url", "fetched_at"
+]
+
+# species id -> species-level fields. The base entry fetches the species once and its varieties reuse it,
+# so a variety only costs its own pokemon/{id} request
+_species = SingleFlight()
+
+
+def species_fields(species_resp):
+    """Everything we keep from a pokemon-species payload, shared by the base entry and all its varieties."""
+    #fetch genus
+    genus = []
+    for gen in species_resp["genera"]:
+        if gen.get("language", {}).get("name") == "en":  # Ensure it's in English
+            genus.append(gen["genus"])
+
+    #fetch egg groups
+    egg_groups = [e["name"] for e in species_resp["egg_groups"]]
+
+    #fetch dex entries
+    flavor_texts = []  # Create a list to store all English flavor texts
+    versions = [] # games flavor texts come from
+    flavor_text_entries = species_resp.get("flavor_text_entries", [])
+    for f in flavor_text_entries:
+            if f.get("language", {}).get("name") == "en":  # Ensure it's in English
+                flavor_texts.append(f.get("flavor_text", ""))  # Append to the list
+                flavor_texts = list(set(flavor_texts))  # Remove duplicates
+                versions.append(f.get("version"))
+
+    #fetch evolution chain (all entries) and details
+    evolution_chain = []
+    triggers = []
+    if "evolution_chain" in species_resp and species_resp["evolution_chain"]["url"]:
+        evo_chain_url = species_resp["evolution_chain"]["url"]
+        evolution_chain, triggers = get_evolution_chain(evo_chain_url) # shared with the rest of the line
+
+    # fetch forms and variants with battle differences; combine into different lists and return them for different uses
+    variants_to_fetch = [] # variants_to_fetch becomes runnable quiz targets, and will be pulled through the variant pipeline
+    variants = [] # just listable for question purposes since we're already handling the data, even if we aren't fetching it.
+    varieties = species_resp.get("varieties", [])
+    for v in varieties:
+        varname = v.get("pokemon", {}).get("name", "")
+        if not v.get("is_default", True):
+            variants.append(varname) #adds all varieties to list for possible question use
+            if not any(uv in varname for uv in UNWANTED_VARIANTS): # if not unwanted
+                url = v.get("pokemon", {}).get("url", "") #get the URL
+                if url:
+                    variant_id = extract_id_from_url(url) #strip the ID from the URL, we're going to run it back through
+                    if variant_id:
+                        variants_to_fetch.append(variant_id) #variant ID is saved as information in the json building so it's easily findable
+
+    return {
+        "genus": genus,
+        "capture_rate": species_resp["capture_rate"], #fetch catch rate
+        "base_happiness": species_resp["base_happiness"], #fetch base happiness
+        "flavor_text": flavor_texts,
+        "versions": versions,
+        "egg_groups": egg_groups,
+        "evolution_chain": evolution_chain,
+        "evolution_chain_details": triggers,
+        "variants": variants,
+        "fetched_variants": variants_to_fetch
+    }
+
+
+def get_species_data(spec_id):
+    """Species-level fields for a species id, fetched once per build no matter how many entries need them."""
+    return _species.get(spec_id, lambda spec_id: species_fields(get_json(API_BASE + f"pokemon-species/{spec_id}")))
+
+
+def clear_species_cache():
+    _species.clear()
+
+
+# field extractors: each takes (pokemon_resp, species) and returns some of the entry's fields
+def pokemon_extractor(pokemon_resp, species):
+    #fetch namme
+    name = pokemon_resp["name"]
+    #fetch types
+    types = [t["type"]["name"] for t in pokemon_resp["types"]]
+
+    #fetch stats and effort values
+    stats = {}
+    effort_values = {}
+    for stat in pokemon_resp["stats"]:
+        stat_name = stat["stat"]["name"]
+        base_stat = stat["base_stat"]
+        effort = stat["effort"]
+        stats[stat_name] = base_stat
+        if effort != 0:
+            effort_values[stat_name] = effort
+
+    #fetch all abilities
+    abilities = []
+    for a in pokemon_resp["abilities"]:
+        ability_name = a["ability"]["name"]
+        ability_effect = get_ability_effect(ability_name)
+        abilities.append({
+            "name": ability_name,
+            "short_effect": ability_effect
+        })
+
+    return {
+        "name": name,
+        "types": types,
+        "stats": stats,
+        "effort_values": effort_values,
+        "abilities": abilities,
         #fetch height & weight
-        height = pokemon_resp["height"]
-        weight = pokemon_resp["weight"]
-        #fetch held item if it can have one 
-        held_items = [item["item"]["name"]
-                      for item in pokemon_resp["held_items"]]
+        "height": pokemon_resp["height"],
+        "weight": pokemon_resp["weight"],
+        #fetch held item if it can have one
+        "held_items": [item["item"]["name"] for item in pokemon_resp["held_items"]],
         #fetch front_default sprite url, for sprite caching later
-        sprite = pokemon_resp["sprites"]["front_default"]
-
-        #fetch egg groups
-        egg_groups = [e["name"] for e in species_resp["egg_groups"]]
-
-        #fetch dex entries
-        flavor_texts = []  # Create a list to store all English flavor texts
-        versions = [] # games flavor texts come from
-        flavor_text_entries = species_resp.get("flavor_text_entries", [])
-        for f in flavor_text_entries:
-                if f.get("language", {}).get("name") == "en":  # Ensure it's in English
-                    flavor_texts.append(f.get("flavor_text", ""))  # Append to the list
-                    flavor_texts = list(set(flavor_texts))  # Remove duplicates
-                    versions.append(f.get("version"))
-
-        #fetch evolution chain (all entries) and details
-        evolution_chain = []
-        if "evolution_chain" in species_resp and species_resp["evolution_chain"]["url"]:
-            evo_chain_url = species_resp["evolution_chain"]["url"]
-            evo_chain_data = requests.get(evo_chain_url).json()
-            evolution_chain = extract_evolution_chain(evo_chain_data["chain"])
-            triggers = extract_evolution_chain_details(evo_chain_data["chain"])
-        
-        # fetch forms with no battle differences
-        forms = []
-        formsprites = []
-        form = pokemon_resp.get("forms", [])
-        for fo in form:
-            formname = fo.get("name")
-            if formname != name:
-                forms.append(formname)
-                formurl = fo.get("url")
-                formid = extract_id_from_url(formurl)
-                formresp = requests.get(API_BASE + f"pokemon-form/{formid}").json()
-                formsprites.append(formresp["sprites"]["front_default"])
-
-
-
-        # fetch forms and variants with battle differences; combine into different lists and return them for different uses
-        variants_to_fetch = [] # variants_to_fetch becomes runnable quiz targets, and will be pulled using the variant script
-        variants = [] # just listable for question purposes since we're already handling the data, even if we aren't fetching it.
-        varieties = species_resp.get("varieties", [])
-        for v in varieties:
-            varname = v.get("pokemon", {}).get("name", "")
-            if not v.get("is_default", True):
-                variants.append(varname) #adds all varieties to list for possible question use
-                unwanted_variants_to_fetch = [
-                    "-gmax",
-                    "-totem",
-                    "-cap",
-                    "-belle",
-                    "-libre",
-                    "-cosplay",
-                    "-phd",
-                    "-pop-star",
-                    "-rock-star",
-                    "-ash",
-                    "-small",
-                    "-large",
-                    "-super",
-                    "-starter"
-                    ] # add varieties you don't want to see here, such as -mega or -alola (or whatever region)
-                if not any(uv in varname for uv in unwanted_variants_to_fetch): # if not unwanted
-                    url = v.get("pokemon", {}).get("url", "") #get the URL
-                    if url:
-                        variant_id = extract_id_from_url(url) #strip the ID from the URL, we're going to run it back through
-                        if variant_id:
-                            variants_to_fetch.append(variant_id) #variant ID is saved as information in the json building so it's easily findable
-
-
-
-        #if you pull more data from a pokemon, you'll have to add it here, as this is the json build
-        return {
-            "id": id,  # Add the Pokémon ID here
-            "name": name,
-            "genus": genus,
-            "capture_rate": catch_rate,
-            "base_happiness": base_happiness,
-            "flavor_text": flavor_texts,
-            "versions": versions,
-            "stats": stats,
-            "effort_values": effort_values,
-            "types": types,
-            "abilities": abilities,
-            "height": height,
-            "weight": weight,
-            "egg_groups": egg_groups,
-            "held_items": held_items,
-            "evolution_chain": evolution_chain,
-            "evolution_chain_details": triggers,
-            "sprite_url": sprite,
-            "form_sprite_url": formsprites,
-            "forms": forms,
-            "variants": variants,
-            "fetched_variants": variants_to_fetch
-            
-        }
+        "sprite_url": pokemon_resp["sprites"]["front_default"]
+    }
+
+
+def species_extractor(pokemon_resp, species):
+    return copy.deepcopy(species) # entries get their own lists, the cached copy stays shared
+
+
+def form_extractor(pokemon_resp, species):
+    # fetch forms with no battle differences
+    forms = []
+    formsprites = []
+    name = pokemon_resp["name"]
+    form = pokemon_resp.get("forms", [])
+    for fo in form:
+        formname = fo.get("name")
+        if formname != name:
+            forms.append(formname)
+            formurl = fo.get("url")
+            formid = extract_id_from_url(formurl)
+            formresp = get_json(API_BASE + f"pokemon-form/{formid}")
+            formsprites.append(formresp["sprites"]["front_default"])
+    return {"forms": forms, "form_sprite_url": formsprites}
+
+
+def genus_override_extractor(pokemon_resp, species):
+    name = pokemon_resp["name"]
+    if name in GENUS_OVERRIDES: # if needs genus fix,
+        return {"genus": GENUS_OVERRIDES[name]} #apply genus fix
+    return {}
+
+
+BASE_EXTRACTORS = [pokemon_extractor, species_extractor, form_extractor]
+VARIANT_EXTRACTORS = [pokemon_extractor, species_extractor, genus_override_extractor]
+
+
+def build_entry(id, extractors, fields, status_callback=None):
+    """One pipeline for every entry: fetch pokemon/{id}, get its species from the shared cache, run the extractors."""
+    try:  # I love error handling
+        pokemon_resp = get_json(API_BASE + f"pokemon/{id}") #pokemon file
+        # species comes from the pokemon file, so base entries and varieties go through the same door
+        spec_id = extract_spec_id_from_url(pokemon_resp["species"]["url"])
+        species = get_species_data(spec_id) #pokemon species file, fetched once per species
+        fetched = {"id": id, "fetched_at": time.strftime("%Y-%m-%d %H:%M:%S")} # fetched_at lets update mode tell how stale an entry is
+        for extractor in extractors:
+            fetched.update(extractor(pokemon_resp, species))
+        return {key: fetched[key] for key in fields}
     except Exception as e:
         print(f"Error fetching Pokémon ID {id}: {e}")
         if status_callback:
             status_callback(f"Error fetching Pokémon ID {id}: {e}")
         return None
-    # shake that URL down for the good stuff
+
+
+def get_pokemon_entry(id, status_callback=None):  # Go catch them mons, fetch them all (data that is)
+    return build_entry(id, BASE_EXTRACTORS, BASE_FIELDS, status_callback)
+
+
+def get_variant_entry(id, status_callback=None): # regional forms, megas and the like
+    return build_entry(id, VARIANT_EXTRACTORS, VARIANT_FIELDS, status_callback)
+
+
+def fetch_variants(fetched_variants: list, status_callback=None, journal=None):
+    """Fetch every variety in fetched_variants, in that order, skipping any an interrupted run already journaled."""
+    load_ability_cache()
+    done = {}
+    if journal: # varieties an interrupted run already finished
+        done = {variant_id: journal.get("variant", variant_id) for variant_id in fetched_variants if journal.get("variant", variant_id)}
+    to_fetch = [variant_id for variant_id in fetched_variants if variant_id not in done]
+    record = (lambda variant_id, entry: journal.record("variant", variant_id, entry)) if journal else None
+    # same engine as the base entries, so both share one request budget; order matches fetched_variants
+    entries = fetch_all(lambda variant_id: get_variant_entry(variant_id, status_callback), to_fetch, "Pokémon variety", status_callback, on_result=record)
+    done.update(zip(to_fetch, entries))
+    all_forms = [done[variant_id] for variant_id in fetched_variants if done.get(variant_id)]
+    save_ability_cache() # variants mostly reuse abilities the base entries already cached
+    save_raw_index()
+    return all_forms #sends it back
+
+
+# shake that URL down for the good stuff
 def extract_id_from_url(url):
     match = re.search(r'/pokemon/(\d+)/', url)
     if match:
@@ -173,128 +274,12 @@ def extract_id_from_url(url):
         return int(match.group(1))
     return None
 
-def get_ability_effect(ability_name):
-    """Fetch the short_effect of an ability by its name."""
-    try:
-        ability_resp = requests.get(
-            API_BASE + f"ability/{ability_name}").json()
-        effect_entries = ability_resp.get("effect_entries", [])
-        for entry in effect_entries:
-            if entry.get("language", {}).get("name") == "en":  # Ensure it's in English
-                return entry.get("short_effect", "No effect description available.")
-        return "No effect description available."
-    except Exception as e:
-        print(f"Error fetching ability {ability_name}: {e}")
-        return "Error fetching effect."
-
-def extract_evolution_chain(chain):
-    evolutions = []
-    
-
-    def recurse(chain_link):
-        if chain_link:
-            evolutions.append(chain_link["species"]["name"])
-            for evo in chain_link.get("evolves_to", []):
-                    recurse(evo)
-    recurse(chain)
-    return evolutions
-
-def extract_evolution_chain_details(chain):
-    triggers = []
-    
-    def find_next_evolution(evolution_details):
-        if not evolution_details:
-            return
-        #ensures we're pulling for our pokemon in question         
-        current_species = evolution_details.get("species", {}).get("name", "unknown")
-        #separates evolution for current pokemon and evolution target, then proceeds through sorting that information for text entries
-        for evo in evolution_details.get("evolves_to", []):
-            evolution_data = evo.get("evolution_details", [])
-            evolves_to = evo.get("species", {}).get("name", "unknown")
-            
-            if evolution_data:
-                for detail in evolution_data:
-                    trigger_desc = f"{current_species} to {evolves_to}: "
-                    trigger_info = detail.get("trigger", {}).get("name", "unknown")
-
-                    # Base trigger
-                    trigger_desc += trigger_info
-                    
-                    # Level requirement
-                    if detail.get("min_level"):
-                        trigger_desc += f" at level {detail['min_level']}"
-                    
-                    # Item usage
-                    if detail.get("item"):
-                        item_name = detail["item"]["name"].replace("-", " ")
-                        trigger_desc = f"{current_species} to {evolves_to}: use a {item_name}"
-                    
-                    # Gender requirement
-                    if detail.get("gender") is not None:
-                        gender = "female" if detail["gender"] == 1 else "male"
-                        trigger_desc += f" ({gender} only)"
-                    
-                    # Held item
-                    if detail.get("held_item"):
-                        held_item_name = detail["held_item"]["name"].replace("-", " ")
-                        trigger_desc += f" while holding {held_item_name}"
-                    
-                    # Known move
-                    if detail.get("known_move"):
-                        trigger_desc += f" knowing {detail['known_move']['name']}"
-                    
-                    # Known move type
-                    if detail.get("known_move_type"):
-                        trigger_desc += f" knowing a {detail['known_move_type']['name']} move"
-                    
-                    # Location
-                    if detail.get("location"):
-                        location_name = detail["location"]["name"].replace("-", " ")
-                        trigger_desc += f" at {location_name}"
-                    
-                    # Affection/Beauty
-                    if detail.get("min_affection"):
-                        trigger_desc += f" with high affection"
-                    if detail.get("min_beauty"):
-                        trigger_desc += f" with high beauty"
-                    
-                    # Happiness
-                    if detail.get("min_happiness"):
-                        trigger_desc += f" with high happiness"
-                    
-                    # Weather
-                    if detail.get("needs_overworld_rain"):
-                        trigger_desc += " while raining"
-                    
-                    # Party requirements
-                    if detail.get("party_species"):
-                        trigger_desc += f" with {detail['party_species']['name']} in party"
-                    if detail.get("party_type"):
-                        trigger_desc += f" with a {detail['party_type']['name']} type in party"
-                    
-                    # Stats comparison
-                    if detail.get("relative_physical_stats") is not None:
-                        stat_relation = {-1: "higher Defense than Attack", 0: "equal Attack and Defense", 1: "higher Attack than Defense"}
-                        trigger_desc += f" with {stat_relation[detail['relative_physical_stats']]}"
-                    
-                    # Time of day
-                    if detail.get("time_of_day"):
-                        trigger_desc += f" during {detail['time_of_day']}"
-                    
-                    # Trade species
-                    if detail.get("trade_species"):
-                        trigger_desc += f" when traded for {detail['trade_species']['name']}"
-                    
-                    # Turn upside down
-                    if detail.get("turn_upside_down"):
-                        trigger_desc += " while holding console upside down"
-                    
-                    triggers.append(trigger_desc)
-
-            find_next_evolution(evo)
-                
-    find_next_evolution(chain)
-    return triggers
+# needed to handle pokemon to species for variants, as variants are the same species.
+def extract_spec_id_from_url(url):
+    match = re.search(r'/pokemon-species/(\d+)/', url)
+    if match:
+        return int(match.group(1))
+    return None
 
 # Clean up the evolution details for stones to make it not "use-item using x" for human readability
 def clean_evolution_detail(detail):
@@ -307,36 +292,172 @@ def clean_evolution_detail(detail):
     return detail
 
 
+def get_species_count(status_callback=None) -> int:
+    """Ask the API how many species exist right now, so new games are picked up without editing POKEMON_COUNT."""
+    try:
+        count = get_json(API_BASE + "pokemon-species?limit=1")["count"]
+        return int(count)
+    except Exception as e:
+        msg = f"Could not get species count, using {POKEMON_COUNT}: {e}"
+        print(msg)
+        if status_callback:
+            status_callback(msg)
+        return POKEMON_COUNT
+
+
+def get_egg_group_name(name: str):
+    """English name for one egg group ("water1" -> "Water 1"), or None if it couldn't be fetched."""
+    try:
+        group_data = get_json(API_BASE + f"egg-group/{name}")
+    except requests.RequestException as e:
+        print(f"Error fetching egg group {name}: {e}")
+        return None
+    return next((n['name'] for n in group_data['names'] if n['language']['name'] == 'en'), group_data['name'])
+
+
+def collect_egg_groups(entries=None, status_callback=None, path: str = egg_group_file) -> dict:
+    """English names for every egg group the entries use (or every egg group there is, if entries is None).
+    Names already in egg_groups.json are kept, the rest are fetched side by side, and the file is rewritten."""
+    egg_group_cache = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                egg_group_cache = json.load(f)
+        except ValueError:
+            egg_group_cache = {}
+    if entries is None:
+        wanted = [group['name'] for group in get_json(API_BASE + "egg-group")['results']]
+    else:
+        wanted = sorted({group for entry in entries for group in entry.get("egg_groups", []) or []})
+    missing = [group for group in wanted if group not in egg_group_cache]
+    for group, english_name in zip(missing, fetch_all(get_egg_group_name, missing, "egg group", status_callback)):
+        if english_name:
+            egg_group_cache[group] = english_name
+    if missing or not os.path.exists(path):
+        write_json_atomic(path, egg_group_cache)
+    return egg_group_cache
+
+
+def is_stale(entry, max_age_days) -> bool:
+    """True if an entry was fetched more than max_age_days ago. Entries from before we tracked it count as stale."""
+    if max_age_days is None:
+        return False
+    fetched_at = entry.get("fetched_at")
+    if not fetched_at:
+        return True
+    try:
+        age = time.time() - time.mktime(time.strptime(fetched_at, "%Y-%m-%d %H:%M:%S"))
+    except ValueError:
+        return True
+    return age > max_age_days * 86400
+
+
+def update(max_age_days=None, status_callback=None):
+    """Fetch only what's missing from professordata (new species, new varieties), optionally refresh
+    entries older than max_age_days, and merge them into the existing file in place."""
+    if not data_exists(): # nothing to update, do the whole thing
+        return main(status_callback)
+    existing = load_pokemon()
+
+    # base entries are the ones the base script built (they carry fetched_variants), everything else is a variety
+    base = {e["id"]: e for e in existing if "fetched_variants" in e}
+    varieties = {e["id"]: e for e in existing if "fetched_variants" not in e}
+    variety_order = [e["id"] for e in existing if "fetched_variants" not in e]
+
+    load_ability_cache()
+    clear_evolution_cache()
+    clear_species_cache()
+    species_count = get_species_count(status_callback)
+    to_fetch = [i for i in range(1, species_count + 1) if i not in base or is_stale(base[i], max_age_days)]
+    msg = f"Updating {len(to_fetch)} Pokémon (species count {species_count})..."
+    print(msg)
+    if status_callback:
+        status_callback(msg)
+    entries = fetch_all(lambda i: get_pokemon_entry(i, status_callback), to_fetch, "Pokémon ID", status_callback)
+    for i, entry in zip(to_fetch, entries):
+        if entry:
+            base[i] = entry
+
+    # varieties every base entry asks for, in the same order a full build would collect them
+    wanted = []
+    for i in sorted(base):
+        for variant_id in base[i].get("fetched_variants", []):
+            if variant_id not in wanted:
+                wanted.append(variant_id)
+    variants_to_fetch = [v for v in wanted if v not in varieties or is_stale(varieties[v], max_age_days)]
+    if variants_to_fetch:
+        for variant_entry in fetch_variants(variants_to_fetch, status_callback):
+            if variant_entry["id"] not in varieties:
+                variety_order.append(variant_entry["id"])
+            varieties[variant_entry["id"]] = variant_entry
+    all_pokemon = [base[i] for i in sorted(base)] + [varieties[v] for v in variety_order]
+    collect_egg_groups(all_pokemon, status_callback) # only groups new to egg_groups.json cost a request
+    save_ability_cache()
+    save_raw_index()
+    clear_species_cache()
+
+    write_pokemon(all_pokemon)
+    build_flavor_index(all_pokemon) # stamped with the file just written
+    msg = f"Updated professordata.jsonl: {len(to_fetch)} Pokémon and {len(variants_to_fetch)} varieties fetched."
+    print(msg)
+    if status_callback:
+        status_callback(msg)
+
+
 def main(status_callback=None):
     all_pokemon = []
     all_variants = set() # we add variants here to pull and append at the end
-    for i in range(1, POKEMON_COUNT + 1):
-        msg = f"Fetching Pokémon ID {i}/{POKEMON_COUNT}..."
+    ids = list(range(1, get_species_count(status_callback) + 1))
+    load_ability_cache() # abilities from earlier builds, so each one is fetched once, ever
+    clear_evolution_cache() # chains and species are only shared within a build, a reset should see fresh ones
+    clear_species_cache()
+    journal = Journal() # everything finished by an earlier, interrupted run
+    if journal.count("pokemon") or journal.count("variant"):
+        msg = f"Resuming: {journal.count('pokemon')} Pokémon and {journal.count('variant')} varieties already done."
         print(msg)
         if status_callback:
             status_callback(msg)
-        entry = get_pokemon_entry(i, status_callback)
+    to_fetch = [i for i in ids if journal.get("pokemon", i) is None]
+    # the engine runs entries side by side and handles the API limits (critical), results come back in ID order
+    fetch_all(lambda i: get_pokemon_entry(i, status_callback), to_fetch, "Pokémon ID", status_callback,
+              on_result=lambda i, entry: journal.record("pokemon", i, entry))
+    entries = [journal.get("pokemon", i) for i in ids]
+    for entry in entries:
         if entry:
             all_pokemon.append(entry)
-            print("Variants to add:", entry.get("fetched_variants", []))
             all_variants.update(entry.get("fetched_variants", []))
-            print(entry.get("fetched_variants", []))
-        time.sleep(0.5)  # Respect API limits (critical)
+    missing = [i for i, entry in zip(ids, entries) if not entry]
+    if missing: # the client already retried these, so say so instead of dropping them quietly
+        msg = f"Could not fetch Pokémon IDs: {missing}"
+        print(msg)
+        if status_callback:
+            status_callback(msg)
     
     if all_variants:
-        variant_entries = variant.main(list(all_variants), status_callback) # runs a different version of this scripting process and pulls it back
+        variant_entries = fetch_variants(list(all_variants), status_callback, journal) # same pipeline with the variant extractors, sharing the species data fetched above
         all_pokemon.extend(variant_entries)
+    collect_egg_groups(all_pokemon, status_callback) # written next to professordata, so first launch has nothing left to fetch
+    save_ability_cache()
+    save_raw_index() # so the next rebuild can revalidate instead of re-downloading
+    clear_species_cache() # done with it, no need to hold every species in memory
 
+    write_pokemon(all_pokemon) # one compact line per entry, swapped in atomically
+    build_flavor_index(all_pokemon) # cleaned and censored once here, the quiz only picks from it
+    journal.discard() # the final file is in place, nothing left to resume
 
-    cache_dir = "professor_cache"
-    poke_file = os.path.join(cache_dir, "professordata.json")
-    os.makedirs(cache_dir, exist_ok=True)
-    with open(poke_file, "w") as c:
-        json.dump(all_pokemon, c, indent=2)
-
-    print("Saved professordata.json successfully!")
+    print("Saved professordata.jsonl successfully!")
+    print(f"HTTP stats: {get_stats()}")
     if status_callback:
-        status_callback("Saved professordata.json successfully!")
+        status_callback("Saved professordata.jsonl successfully!")
 
 if __name__ == "__main__":
-    main()
+    import sys
+    if "--offline" in sys.argv: # rebuild purely from professor_cache/raw
+        set_offline(True)
+    if "--update" in sys.argv: # only fetch what's new, e.g. --update --max-age-days 30 to also refresh old entries
+        max_age_days = None
+        if "--max-age-days" in sys.argv:
+            max_age_days = float(sys.argv[sys.argv.index("--max-age-days") + 1])
+        update(max_age_days)
+    else:
+        main()
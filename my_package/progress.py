@@ -0,0 +1,152 @@
+import sys
+import threading
+import time
+
+# structured progress for the long jobs (generator, varieties, sprites, cache clearing): each update carries the
+# numbers, not just a sentence, so a renderer can show rate, retries and time left. events are plain strings too,
+# so a status_callback that only knows how to show text keeps working
+EMIT_INTERVAL = 0.1 # seconds between updates for one phase; the first and last always go out
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_eta(seconds) -> str:
+    if seconds is None:
+        return "--:--"
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def _counters() -> dict:
+    # imported here rather than at the top: http_client needs fetch_engine, which reports through this module
+    from my_package.http_client import get_counters
+    return get_counters()
+
+
+class ProgressEvent(str):
+    """One progress update: phase, done, total, bytes, rate (requests/sec), retries, eta (seconds or None), finished.
+    As a string it's the readable one-line version."""
+    def __new__(cls, phase: str, done: int, total: int, bytes: int = 0, rate: float = 0.0, retries: int = 0,
+                eta=None, finished: bool = False):
+        percent = round(done / total * 100) if total else 100
+        parts = [f"{phase} {done}/{total} ({percent}%)"]
+        if rate:
+            parts.append(f"{rate:.1f} req/s")
+        if retries:
+            parts.append(f"{retries} retries")
+        if bytes:
+            parts.append(format_bytes(bytes))
+        parts.append("done" if finished else f"ETA {format_eta(eta)}")
+        event = super().__new__(cls, " | ".join(parts))
+        event.phase = phase
+        event.done = done
+        event.total = total
+        event.bytes = bytes
+        event.rate = rate
+        event.retries = retries
+        event.eta = eta
+        event.finished = finished
+        return event
+
+
+class TerminalRenderer:
+    """Draws events on one line that rewrites itself, or prints every 10% when the output isn't a terminal."""
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.live = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.width = 0
+        self.printed = {} # phase -> last tenth printed, when not live
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        with self.lock:
+            if not isinstance(event, ProgressEvent):
+                self._line(str(event), True)
+            elif self.live:
+                self._line(event, event.finished)
+            else:
+                tenth = event.done * 10 // event.total if event.total else 10
+                if event.finished or tenth > self.printed.get(event.phase, -1):
+                    self.printed[event.phase] = tenth
+                    self.stream.write(event + "\n")
+                    self.stream.flush()
+
+    def _line(self, text: str, newline: bool):
+        if self.live:
+            self.stream.write("\r" + text.ljust(self.width))
+            self.width = 0 if newline else len(text)
+            self.stream.write("\n" if newline else "")
+        else:
+            self.stream.write(text + "\n")
+        self.stream.flush()
+
+
+class TkRenderer:
+    """Shows events on a label, and on a ttk.Progressbar if given. Runs on the Tk thread, e.g. as a UIEventBus handler."""
+    def __init__(self, label, bar=None):
+        self.label = label
+        self.bar = bar
+
+    def __call__(self, event):
+        self.label.config(text=str(event))
+        if self.bar is not None and isinstance(event, ProgressEvent):
+            self.bar.config(maximum=max(event.total, 1), value=event.done)
+
+
+terminal = TerminalRenderer() # where progress goes on the console, instead of a print per item
+
+
+class Progress:
+    """Counts one phase of work from any number of threads and reports it, at most every EMIT_INTERVAL seconds,
+    to the terminal and to status_callback. Rate, retries and bytes come from the shared http client's counters."""
+    def __init__(self, phase: str, total: int, status_callback=None, renderer=terminal):
+        self.phase = phase
+        self.total = total
+        self.status_callback = status_callback
+        self.renderer = renderer
+        self.done = 0
+        self.started = time.monotonic()
+        self.last_emit = 0.0
+        self.start_counters = _counters()
+        self.lock = threading.Lock()
+        self.emit(self.event())
+
+    def event(self, finished: bool = False) -> ProgressEvent:
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        counters = _counters()
+        requests = counters["requests"] - self.start_counters["requests"]
+        eta = None
+        if self.done:
+            eta = (self.total - self.done) * elapsed / self.done
+        return ProgressEvent(self.phase, self.done, self.total,
+                             bytes=counters["bytes"] - self.start_counters["bytes"],
+                             rate=requests / elapsed if requests else 0.0,
+                             retries=counters["retries"] - self.start_counters["retries"],
+                             eta=eta, finished=finished)
+
+    def emit(self, event: ProgressEvent):
+        self.last_emit = time.monotonic()
+        if self.renderer:
+            self.renderer(event)
+        if self.status_callback:
+            self.status_callback(event)
+
+    def advance(self, amount: int = 1):
+        with self.lock:
+            self.done += amount
+            if self.done < self.total and time.monotonic() - self.last_emit < EMIT_INTERVAL:
+                return
+            event = self.event(finished=self.done >= self.total)
+            self.emit(event)
+
+    def finish(self):
+        """Final event, if advance didn't already send one at done == total (e.g. nothing to do, or some skipped)."""
+        with self.lock:
+            if self.done < self.total or self.total == 0:
+                self.emit(self.event(finished=True))
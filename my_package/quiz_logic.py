@@ -23,8 +23,36 @@ def format_pokemon_name(name: str) -> str:
     
     return name.title()
 
-def generate_questions(pokemon: Dict, egg_group_cache: Dict, all_pokemon: List[Dict]) -> List[Dict]:
-    """Generate quiz questions based on Pokémon data."""
+REJECTION_TRIES = 32 # random picks from a plain list before falling back to filtering it
+
+def pick_other_pokemon(all_pokemon, name: str, rng=random) -> Dict:
+    """A random Pokémon other than name that has flavor text, from either the plain list or one of the stores
+    (sqlite_store.PokemonRepository, lazy_store.LazyPokemonData). None if there isn't one."""
+    if hasattr(all_pokemon, "random_other"): # the stores keep a pool of names to sample from
+        return all_pokemon.random_other(name, rng=rng)
+    if not all_pokemon:
+        return None
+    for _ in range(REJECTION_TRIES): # almost every pick is fine, so no copy of the list
+        p = rng.choice(all_pokemon)
+        if p['name'] != name and p.get('flavor_text'):
+            return p
+    candidates = [p for p in all_pokemon if p['name'] != name and p.get('flavor_text')]
+    return rng.choice(candidates) if candidates else None
+
+def pick_other_flavor(all_pokemon, name: str, flavor_pool=None, rng=random):
+    """(name, flavor text) of a random Pokémon other than name, or None. Already censored if it came from flavor_pool."""
+    if flavor_pool is not None:
+        return flavor_pool.other(name, rng)
+    other_pokemon = pick_other_pokemon(all_pokemon, name, rng)
+    if not other_pokemon or not other_pokemon.get('flavor_text'):
+        return None
+    return other_pokemon['name'], rng.choice(other_pokemon['flavor_text'])
+
+def generate_questions(pokemon: Dict, egg_group_cache: Dict, all_pokemon: List[Dict], flavor_pool=None, rng=None) -> List[Dict]:
+    """Generate quiz questions based on Pokémon data. flavor_pool is a flavor_index.FlavorPool of already censored
+    text; without it, the raw flavor text is censored here with censor_pokemon_names.
+    rng is anything with random() and choice(), e.g. a seeded random.Random, default the random module."""
+    rng = rng or random
     # Format the Pokémon name for display
     display_name = format_pokemon_name(pokemon.get('name'))
     
@@ -94,26 +122,24 @@ def generate_questions(pokemon: Dict, egg_group_cache: Dict, all_pokemon: List[D
             )
 
     # get a random flavor text from our pokemon or from all_pokemon, then censor pokemon names.
-    flavor_texts = pokemon.get('flavor_text', [])
+    # with the pool the text is already cleaned and censored, so this is just picking
+    if flavor_pool is not None:
+        flavor_texts = flavor_pool.texts(pokemon['name'])
+    else:
+        flavor_texts = pokemon.get('flavor_text', [])
     if flavor_texts:
-        use_current = random.random() < .65 # weight to decide current pokemon or a random one
-        if use_current:
-            chosen_text = random.choice(flavor_texts) #picks a random entry
+        other = None
+        if rng.random() >= .65: # weight to decide current pokemon or a random one
+            other = pick_other_flavor(all_pokemon, pokemon['name'], flavor_pool, rng)
+        if other is None: # current pokemon, or there was no other one with an entry
+            chosen_text = rng.choice(flavor_texts) #picks a random entry
             names_to_censor = [pokemon['name']]
-            censored_entry = censor_pokemon_names(chosen_text, names_to_censor)
             correct_answer = True
         else:
-            other_pokemon = random.choice([p for p in all_pokemon if p['name'] != pokemon['name']])
-            flavor_pokemon_name = other_pokemon['name']
-            other_flavor_texts = other_pokemon.get('flavor_text', [])
-            if other_flavor_texts:
-                chosen_text = random.choice(other_flavor_texts)
-                names_to_censor = [pokemon['name'], flavor_pokemon_name]
-                censored_entry = censor_pokemon_names(chosen_text, names_to_censor)
-                correct_answer = False
-            else:
-                chosen_text = random.choice(flavor_texts)
-                correct_answer = True
+            flavor_pokemon_name, chosen_text = other
+            names_to_censor = [pokemon['name'], flavor_pokemon_name]
+            correct_answer = False
+        censored_entry = chosen_text if flavor_pool is not None else censor_pokemon_names(chosen_text, names_to_censor)
         #adds this question to the list with the information above.
         questions.append(
             {
@@ -126,6 +152,43 @@ def generate_questions(pokemon: Dict, egg_group_cache: Dict, all_pokemon: List[D
 
     return questions
 
+def unit_answers(pokemon: Dict, use_metric: bool) -> Dict:
+    """The answers that depend on the unit system, by question field."""
+    return {
+        "height": format_height(pokemon.get('height'), use_metric),
+        "weight": format_weight(pokemon.get('weight') / 10, use_metric),
+    }
+
+class QuestionBank:
+    """Questions built once per Pokémon for the session, so the random picks (the pokedex entry, true or false) stay
+    the same every time it's quizzed. Height and weight answers are rendered once per unit system and swapped in."""
+    def __init__(self, egg_group_cache: Dict, all_pokemon, flavor_pool=None, rng=None):
+        self.egg_group_cache = egg_group_cache
+        self.all_pokemon = all_pokemon
+        self.flavor_pool = flavor_pool
+        self.rng = rng
+        self.questions = {} # name -> questions as first generated
+        self.renders = {} # (name, use_metric) -> {field: answer}
+
+    def get(self, pokemon: Dict, use_metric: bool) -> List[Dict]:
+        """A fresh copy of the Pokémon's questions (no answers filled in yet) in the given units."""
+        name = pokemon['name']
+        if name not in self.questions:
+            self.questions[name] = generate_questions(
+                pokemon, self.egg_group_cache, self.all_pokemon, self.flavor_pool, self.rng)
+        return self.set_units(pokemon, [dict(q) for q in self.questions[name]], use_metric)
+
+    def set_units(self, pokemon: Dict, questions: List[Dict], use_metric: bool) -> List[Dict]:
+        """Switch questions to the other unit system in place, keeping whatever was answered already."""
+        key = (pokemon['name'], use_metric)
+        if key not in self.renders:
+            self.renders[key] = unit_answers(pokemon, use_metric)
+        answers = self.renders[key]
+        for question in questions:
+            if question["field"] in answers:
+                question["answer"] = answers[question["field"]]
+        return questions
+
 # for boolean questions
 def check_boolean_answer(user_answer: bool, correct_answer: bool) -> bool:
     """Check if the boolean answer is correct."""
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import threading
+from my_package.checkpoint import write_bytes_atomic, write_json_atomic
+
+# every PokeAPI json body we've fetched, stored by the hash of its content, plus an index of url -> hash/ETag/Last-Modified.
+# a rebuild revalidates against this instead of re-downloading, or skips the network entirely in offline mode
+cache_dir = "professor_cache"
+raw_dir = os.path.join(cache_dir, "raw")
+objects_dir = os.path.join(raw_dir, "objects")
+index_file = os.path.join(raw_dir, "index.json")
+SAVE_EVERY = 100 # new responses between index saves, so a crash mid-build only loses a few
+
+_index = None
+_lock = threading.Lock()
+_save_lock = threading.Lock() # one save at a time: they share index.json.tmp, and a newer snapshot must land last
+_unsaved = 0
+
+
+def load_raw_index() -> dict:
+    """Load the url index from disk, once per process."""
+    global _index
+    with _lock:
+        if _index is None:
+            _index = {}
+            if os.path.exists(index_file):
+                try:
+                    with open(index_file, 'r') as f:
+                        _index = json.load(f)
+                except:
+                    _index = {}
+        return _index
+
+
+def save_raw_index():
+    """Write the url index to disk atomically."""
+    global _unsaved
+    with _save_lock: # recording a response only needs _lock, so other workers aren't held up by the write
+        with _lock:
+            if _index is None:
+                return
+            data = dict(_index)
+            _unsaved = 0
+        write_json_atomic(index_file, data)
+
+
+def _object_path(digest: str) -> str:
+    return os.path.join(objects_dir, digest[:2], f"{digest}.json") # fan out so no folder holds thousands of files
+
+
+def lookup(url: str):
+    """Return the stored metadata for a url (hash, etag, last_modified), or None if we've never fetched it."""
+    return load_raw_index().get(url)
+
+
+def read_body(meta: dict):
+    """Return the stored body bytes for an index entry, or None if the object went missing."""
+    path = _object_path(meta["hash"])
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def store(url: str, body: bytes, etag: str = None, last_modified: str = None):
+    """Save a response body and point the url at it. Identical bodies share one object."""
+    global _unsaved
+    digest = hashlib.sha256(body).hexdigest()
+    path = _object_path(digest)
+    if not os.path.exists(path):
+        # per thread temp file, two workers can land on the same body
+        write_bytes_atomic(path, body, f"{path}.{threading.get_ident()}.tmp")
+    index = load_raw_index()
+    with _lock:
+        index[url] = {"hash": digest, "etag": etag, "last_modified": last_modified}
+        _unsaved += 1
+        due = _unsaved >= SAVE_EVERY
+    if due:
+        save_raw_index()
@@ -1,14 +1,20 @@
 import os
 import json
-import requests
 import time
+from my_package.http_client import get_content
+from my_package.data_store import data_exists, iter_pokemon
+from my_package.fetch_engine import fetch_all, MAX_WORKERS
+from my_package.sprite_pack import SpritePackWriter, import_sprites, pack_file
+from my_package.sprite_render import refresh_renders
+from my_package.cache_bundle import seed_bundle
 
 # Ensure cache directory exists
 
 cache_dir = "professor_cache"
-sprites_dir = os.path.join(cache_dir, "sprites")
-poke_file = os.path.join(cache_dir, "professordata.json")
+sprites_dir = os.path.join(cache_dir, "sprites") # loose files from before the sprite pack, imported on the next run
+poke_file = os.path.join(cache_dir, "professordata.jsonl")
 counter_file = os.path.join(cache_dir, "utility.json")
+RETRY_ROUNDS = 1 # extra passes over sprites that still failed after the http client's own retries
 
 def load_counter():
     """Load the sprite download counter."""
@@ -21,116 +27,127 @@ def load_counter():
     return {"total_downloaded": 0, "last_update": ""}
 
 def save_counter(counter):
-    """Save the sprite download counter."""
+    """Save the sprite download counter, keeping the other settings in utility.json (units, use_sqlite)."""
+    data = {}
+    if os.path.exists(counter_file):
+        try:
+            with open(counter_file, 'r') as f:
+                data = json.load(f)
+        except:
+            pass
+    data.update(counter)
     with open(counter_file, 'w') as f:
-        json.dump(counter, f)
+        json.dump(data, f)
 
-def cache_sprites(status_callback=None, sprite_callback=None):
-    #make directory, don't overwrite if it exists
-    os.makedirs(sprites_dir, exist_ok=True)
+def sprite_files(entry: dict):
+    """(filename, url) for every sprite an entry should have: the default one, then any form sprites."""
+    name = entry.get('name')
+    url = entry.get('sprite_url')
+    if url and name:
+        yield f"{name}{os.path.splitext(url)[1] or '.png'}", url
+    forms = entry.get("forms")
+    formurl = entry.get('form_sprite_url')
+    if isinstance(forms, list) and isinstance(formurl, list):
+        for form_name, form_url in zip(forms, formurl):
+            if form_url and form_name:
+                yield f"{form_name}{os.path.splitext(form_url)[1] or '.png'}", form_url
+
+def download_sprite(job, writer: SpritePackWriter) -> str:
+    """Fetch one (filename, url) into the sprite pack. Returns None on success, the error message on failure."""
+    filename, url = job
+    try:
+        content = get_content(url) # shared session: retries with backoff and the global rate limit live in there
+        writer.add(filename, content) # only becomes visible once the pack index is saved, never half-written
+        return None
+    except Exception as e:
+        return f"{url}: {e}"
+
+def cache_sprites(status_callback=None, sprite_callback=None, repo=None, only=None, max_workers: int = MAX_WORKERS) -> dict:
+    """Download any missing sprites. Reads urls from professordata, or from an open store (sqlite or lazy) if given.
+    only: a set of filenames to limit the pass to, e.g. the ones the cache manifest found missing or corrupt.
+    Returns {"downloaded": [filenames], "cached": [filenames], "failed": {filename: error}}."""
+    report = {"downloaded": [], "cached": [], "failed": {}}
     
     # Reset counter at start
     counter = {"total_downloaded": 0, "last_update": time.strftime("%Y-%m-%d %H:%M:%S")}
     save_counter(counter)
     
-    downloaded_count = 0
-    cached_count = 0
-    
-    #open generator json file so we can pull urls
-    if os.path.exists(poke_file):
-        with open(poke_file, 'r') as d:
-            data = json.load(d)
+    #stream the generator file (or query the database) so we can pull urls without holding all of it
+    if repo is not None:
+        entries = repo.sprite_entries()
+    elif data_exists(poke_file):
+        entries = iter_pokemon(poke_file)
+    else:
+        return report
     
-    # Calculate total number of sprites to process (including forms)
-    total_sprites = len(data)
-    for entry in data:
-        forms = entry.get("forms", [])
-        if isinstance(forms, list):
-            total_sprites += len(forms)
+    # loose pngs from an older cache go into the pack instead of being downloaded again
+    imported = import_sprites(sprites_dir, pack_file)
+    if imported:
+        msg = f"Packed {imported} existing sprites"
+        print(msg)
+        if status_callback:
+            status_callback(msg)
+    bundle = seed_bundle()
+    bundled = bundle.sprite_names() if bundle is not None else set() # served straight out of professor_cache.zip
+    with SpritePackWriter(pack_file) as writer: # saves the index on the way out, even if something raised
+        # one streamed pass: everything already packed counts as cached, the rest is queued up.
+        # on a repair pass (only=...) everything listed is fetched again, packed or not, since it may be corrupt
+        jobs = []
+        for entry in entries:
+            for filename, url in sprite_files(entry):
+                if only is not None:
+                    if filename in only:
+                        jobs.append((filename, url))
+                elif filename in writer.entries or filename in bundled:
+                    report["cached"].append(filename)
+                    if sprite_callback:
+                        sprite_callback(filename)
+                else:
+                    jobs.append((filename, url))
     
-    current_sprite = 0
-    #pull urls for each pokemon
-    for entry in data:
-        name = entry.get('name')
-        url = entry.get('sprite_url')
-        forms = entry.get("forms")
-        formurl = entry.get('form_sprite_url')
-        if url and name:
-            current_sprite += 1
-            ext = os.path.splitext(url)[1] or '.png' 
-            filename = f"{name}{ext}"# Use the Pokémon name as the filename
-            filepath = os.path.join(sprites_dir, filename)
-            # Skip if already cached
-            if os.path.exists(filepath):
-                # Uncomment for debugging
-                if sprite_callback:
-                    sprite_callback(filepath)
-                msg = f"Already cached: {filename} ({current_sprite}/{total_sprites})"
-                print(msg) # cache confirmation
+        # a few downloads at a time under the shared token bucket, instead of one every half second
+        for attempt in range(RETRY_ROUNDS + 1):
+            if not jobs:
+                break
+            if attempt:
+                msg = f"Retrying {len(jobs)} failed sprites..."
+                print(msg)
                 if status_callback:
                     status_callback(msg)
-                cached_count += 1
-            else:
-                try:
-                    print(f"Downloading {url} ... ({current_sprite}/{total_sprites})")
-                    resp = requests.get(url)
-                    resp.raise_for_status()
-                    with open(filepath, 'wb') as img_file:
-                        img_file.write(resp.content)
-                    msg = f"Saved: {filename} ({current_sprite}/{total_sprites})"
-                    print(msg)
-                    if status_callback:
-                        status_callback(msg)
-                    downloaded_count += 1
-                    time.sleep(.5)  # Sleep for .5 second between downloads
-                except Exception as e:
-                    msg = f"Failed to download {form_url}: {e}"
-                    print(msg)
-                    if status_callback:
-                        status_callback(msg)
-
-        #pulls form sprites only if they are different from the default. Uncomment if you want to run forms.
-        if isinstance(forms, list) and isinstance(formurl, list):
-            for form_name, form_url in zip(forms, formurl):
-                if not form_url or not form_name:
-                    #print(f"Skipping form: {form_name}, url: {form_url}")
-                    continue
-                current_sprite += 1
-                ext = os.path.splitext(form_url)[1] or '.png'
-                filename = f"{form_name}{ext}"
-                filepath = os.path.join(sprites_dir, filename)
-                if os.path.exists(filepath):
-                    cached_count += 1
-                    continue
-                try:
-                    print(f"Downloading {form_url} ({current_sprite}/{total_sprites})")
-                    resp = requests.get(form_url)
-                    resp.raise_for_status()
-                    with open(filepath, 'wb') as img_file:
-                        img_file.write(resp.content)
-                    msg = f"Saved: {filename} ({current_sprite}/{total_sprites})"
-                    print(msg)
-                    if status_callback:
-                        status_callback(msg)
-                    downloaded_count += 1
-                    time.sleep(.5)
-                except Exception as e:
-                    msg = f"Failed to download {form_url}: {e}"
-                    print(msg)
-                    if status_callback:
-                        status_callback(msg)
-                    continue
+            errors = fetch_all(lambda job: download_sprite(job, writer), jobs, label="sprite",
+                               status_callback=status_callback, max_workers=max_workers)
+            retry = []
+            for job, error in zip(jobs, errors):
+                if error is None:
+                    report["downloaded"].append(job[0])
+                    report["failed"].pop(job[0], None)
+                else:
+                    report["failed"][job[0]] = error
+                    retry.append(job)
+            jobs = retry
+    
+    # final grade renders are made when first shown; any already made for a sprite that was just re-downloaded are stale
+    refresh_renders(report["downloaded"], status_callback=status_callback)
+    
+    for filename, error in report["failed"].items():
+        msg = f"Failed to download {filename}: {error}"
+        print(msg)
+        if status_callback:
+            status_callback(msg)
     
     # Update counter with both downloaded and cached sprites
-    total_sprites = downloaded_count + cached_count
+    total_sprites = len(report["downloaded"]) + len(report["cached"])
     counter["total_downloaded"] = total_sprites
     counter["last_update"] = time.strftime("%Y-%m-%d %H:%M:%S")
     save_counter(counter)
     
     # Show summary message
-    if downloaded_count > 0:
-        if status_callback:
-            status_callback(f"Downloaded {downloaded_count} new sprites. Total sprites: {total_sprites}")
+    if report["downloaded"]:
+        msg = f"Downloaded {len(report['downloaded'])} new sprites. Total sprites: {total_sprites}"
     else:
-        if status_callback:
-            status_callback(f"No new sprites downloaded. Total sprites: {total_sprites}")
\ No newline at end of file
+        msg = f"No new sprites downloaded. Total sprites: {total_sprites}"
+    if report["failed"]:
+        msg += f" ({len(report['failed'])} failed)"
+    if status_callback:
+        status_callback(msg)
+    return report
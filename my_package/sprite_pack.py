@@ -0,0 +1,299 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from my_package.cache_bundle import seed_bundle
+from my_package.checkpoint import write_bytes_atomic, file_stamp
+
+# every sprite in one data file plus a small sorted binary index, instead of 1,300+ loose pngs that are slow to
+# scan, copy and delete. the index is searched straight out of an mmap, so opening it costs nothing
+cache_dir = "professor_cache"
+sprites_dir = os.path.join(cache_dir, "sprites") # the old loose files, and where export_sprites puts them back
+pack_file = os.path.join(cache_dir, "sprites.pack")
+INDEX_MAGIC = b"SPIX"
+INDEX_VERSION = 1
+HEADER = struct.Struct("<4sII") # magic, version, entry count
+RECORD = struct.Struct("<64sQII") # name (utf-8, zero padded), offset, length, crc32; records sorted by name
+SAVE_EVERY = 100 # new sprites between index saves, so a crash mid-download only loses a few
+
+
+def index_path(path: str = pack_file) -> str:
+    return os.path.splitext(path)[0] + ".idx"
+
+
+def _encode_name(name: str) -> bytes:
+    encoded = name.encode("utf-8")
+    if len(encoded) > RECORD.size - 16:
+        raise ValueError(f"Sprite name too long for the pack index: {name}")
+    return encoded
+
+
+def read_index(path: str = pack_file) -> dict:
+    """The whole index as {name: (offset, length, crc32)}, for writers and tools. Readers use SpritePack."""
+    entries = {}
+    try:
+        with open(index_path(path), 'rb') as f:
+            data = f.read()
+    except OSError:
+        return entries
+    if len(data) < HEADER.size:
+        return entries
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION or len(data) < HEADER.size + count * RECORD.size:
+        return entries
+    for i in range(count):
+        name, offset, length, crc = RECORD.unpack_from(data, HEADER.size + i * RECORD.size)
+        entries[name.rstrip(b"\0").decode("utf-8")] = (offset, length, crc)
+    return entries
+
+
+def write_index(entries: dict, path: str = pack_file):
+    """Write the sorted index next to the pack, atomically."""
+    records = sorted((_encode_name(name), value) for name, value in entries.items())
+    data = [HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(records))]
+    data.extend(RECORD.pack(name, offset, length, crc) for name, (offset, length, crc) in records)
+    write_bytes_atomic(index_path(path), b"".join(data))
+
+
+class SpritePackWriter:
+    """Appends sprites to the pack from any number of threads; the index is only swapped in on save/close,
+    so readers never see a sprite whose bytes aren't fully written. Re-adding a name replaces it."""
+    def __init__(self, path: str = pack_file):
+        self.path = path
+        self.entries = read_index(path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, 'ab')
+        self.offset = self.file.seek(0, os.SEEK_END) # anything past the last indexed sprite is just unused bytes
+        self.unsaved = 0
+        self.lock = threading.Lock()
+
+    def add(self, name: str, data: bytes):
+        _encode_name(name)
+        with self.lock:
+            self.file.write(data)
+            self.entries[name] = (self.offset, len(data), zlib.crc32(data))
+            self.offset += len(data)
+            self.unsaved += 1
+            if self.unsaved >= SAVE_EVERY:
+                self._save()
+
+    def _save(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        write_index(self.entries, self.path)
+        self.unsaved = 0
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def close(self):
+        with self.lock:
+            self._save()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close() # everything added so far is complete, keep it even if the caller failed
+
+
+class SpritePack:
+    """Read-only view of the pack. Lookups binary search the mmapped index, sprite bytes are sliced out of the
+    mmapped data file."""
+    def __init__(self, path: str = pack_file):
+        self.path = path
+        self.count = 0
+        self.index = self.data = None
+        self.files = []
+        try:
+            index_file = open(index_path(path), 'rb')
+            self.files.append(index_file)
+            self.index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count = HEADER.unpack_from(self.index)
+            if magic == INDEX_MAGIC and version == INDEX_VERSION and len(self.index) >= HEADER.size + count * RECORD.size:
+                self.count = count
+            data_file = open(path, 'rb')
+            self.files.append(data_file)
+            if os.path.getsize(path):
+                self.data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, struct.error): # no pack yet (or an empty/unreadable one), acts as empty
+            self.count = 0
+        self.lock = threading.Lock()
+
+    def close(self):
+        """Let go of the files (Windows won't delete them while they're mapped)."""
+        with self.lock:
+            for mapped in (self.index, self.data):
+                if mapped is not None:
+                    mapped.close()
+            self.index = self.data = None
+            self.count = 0
+            for f in self.files:
+                f.close()
+            self.files = []
+
+    def __len__(self):
+        return self.count
+
+    def _record(self, i: int):
+        name, offset, length, crc = RECORD.unpack_from(self.index, HEADER.size + i * RECORD.size)
+        return name.rstrip(b"\0"), offset, length, crc
+
+    def _find(self, name: str):
+        key = name.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record = self._record(middle)
+            if record[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            record = self._record(low)
+            if record[0] == key:
+                return record
+        return None
+
+    def __contains__(self, name: str) -> bool:
+        with self.lock:
+            return self._find(name) is not None
+
+    def names(self) -> list:
+        with self.lock:
+            return [self._record(i)[0].decode("utf-8") for i in range(self.count)]
+
+    def get(self, name: str):
+        """The sprite's bytes, or None if it isn't in the pack (or its bytes don't match the checksum)."""
+        with self.lock:
+            record = self._find(name)
+            if record is None or self.data is None:
+                return None
+            _, offset, length, crc = record
+            if offset + length > len(self.data):
+                return None
+            data = self.data[offset:offset + length]
+        return data if zlib.crc32(data) == crc else None
+
+    def verify(self) -> set:
+        """Names whose bytes are missing or don't match their checksum."""
+        return {name for name in self.names() if self.get(name) is None}
+
+
+# one shared reader per pack for the UI, reopened whenever that pack's index has been rewritten since
+_readers = {} # path -> (SpritePack, index stamp)
+_reader_lock = threading.Lock()
+
+
+def read_packed(name: str, path: str = pack_file):
+    """Bytes for name out of the pack at path, or None."""
+    with _reader_lock:
+        stamp = file_stamp(index_path(path))
+        reader, reader_stamp = _readers.get(path, (None, None))
+        if reader is None or stamp != reader_stamp:
+            if reader is not None:
+                reader.close()
+            reader = SpritePack(path)
+            _readers[path] = (reader, stamp)
+        return reader.get(name)
+
+
+def read_sprite(name: str, path: str = pack_file):
+    """Bytes for a sprite like "bulbasaur.png": from the pack, a loose file in sprites/, or professor_cache.zip."""
+    data = read_packed(name, path)
+    if data is None:
+        loose = os.path.join(os.path.dirname(path) or ".", "sprites", name)
+        if os.path.isfile(loose):
+            with open(loose, 'rb') as f:
+                data = f.read()
+    if data is None:
+        bundle = seed_bundle()
+        if bundle is not None:
+            data = bundle.sprite(name)
+    return data
+
+
+def close_reader():
+    """Drop the shared readers, e.g. before the cache clearer deletes the packs."""
+    with _reader_lock:
+        for reader, _ in _readers.values():
+            reader.close()
+        _readers.clear()
+
+
+def import_sprites(src_dir: str = sprites_dir, path: str = pack_file, skip_existing: bool = True) -> int:
+    """Pack loose sprite files (e.g. from an older cache). Returns how many were added."""
+    if not os.path.isdir(src_dir):
+        return 0
+    added = 0
+    with SpritePackWriter(path) as writer:
+        for filename in sorted(os.listdir(src_dir)):
+            filepath = os.path.join(src_dir, filename)
+            if not os.path.isfile(filepath) or filename.endswith(".tmp"):
+                continue
+            if skip_existing and filename in writer.entries:
+                continue
+            with open(filepath, 'rb') as f:
+                writer.add(filename, f.read())
+            added += 1
+    return added
+
+
+def export_sprites(dest_dir: str = sprites_dir, path: str = pack_file) -> int:
+    """Write every packed sprite back out as a loose file. Returns how many were written."""
+    os.makedirs(dest_dir, exist_ok=True)
+    pack = SpritePack(path)
+    written = 0
+    try:
+        for name in pack.names():
+            data = pack.get(name)
+            if data is None:
+                print(f"Skipping corrupt sprite: {name}")
+                continue
+            write_bytes_atomic(os.path.join(dest_dir, name), data)
+            written += 1
+    finally:
+        pack.close()
+    return written
+
+
+def compact(path: str = pack_file) -> int:
+    """Rewrite the pack without replaced or orphaned bytes. Returns the new data size."""
+    pack = SpritePack(path)
+    tmp_path = path + ".compact"
+    entries = {}
+    try:
+        with open(tmp_path, 'wb') as f:
+            for name in pack.names():
+                data = pack.get(name)
+                if data is None:
+                    continue
+                entries[name] = (f.tell(), len(data), zlib.crc32(data))
+                f.write(data)
+            size = f.tell()
+            f.flush()
+            os.fsync(f.fileno())
+    finally:
+        pack.close()
+    close_reader()
+    os.replace(tmp_path, path)
+    write_index(entries, path)
+    return size
+
+
+if __name__ == "__main__":
+    import sys
+    # python -m my_package.sprite_pack export [dir] | import [dir] | compact
+    command = sys.argv[1] if len(sys.argv) > 1 else "export"
+    folder = sys.argv[2] if len(sys.argv) > 2 else sprites_dir
+    if command == "export":
+        print(f"Exported {export_sprites(folder)} sprites to {folder}")
+    elif command == "import":
+        print(f"Packed {import_sprites(folder)} sprites from {folder}")
+    elif command == "compact":
+        print(f"Compacted {pack_file} to {compact()} bytes")
+    else:
+        print("usage: python -m my_package.sprite_pack [export|import|compact] [dir]")
@@ -0,0 +1,85 @@
+import io
+import os
+from PIL import Image, ImageOps
+from my_package.progress import Progress
+from my_package.sprite_pack import SpritePackWriter, read_index, read_packed, read_sprite, pack_file
+
+# the final grade sprite, resized (and grayed out for a failing grade) the first time it's shown, then kept in
+# their own pack next to the originals, so showing it again is a png decode instead of a channel split and a resize
+cache_dir = "professor_cache"
+renders_file = os.path.join(cache_dir, "sprite_renders.pack")
+RENDER_SIZE = (200, 200)
+VARIANTS = ("color", "grayscale")
+
+
+def render_key(name: str, variant: str) -> str:
+    return f"{variant}/{name}"
+
+
+def render_image(data: bytes, variant: str) -> Image.Image:
+    """One sprite at RENDER_SIZE, grayscale keeping the original alpha."""
+    image = Image.open(io.BytesIO(data))
+    if variant == "grayscale":
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        a = image.split()[3]
+        gray = ImageOps.grayscale(image)
+        image = Image.merge('RGBA', (gray, gray, gray, a))
+    return image.resize(RENDER_SIZE, Image.Resampling.LANCZOS)
+
+
+def encode_png(image: Image.Image) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+def render_sprite(data: bytes, variant: str) -> bytes:
+    """render_image, encoded as png for the pack."""
+    return encode_png(render_image(data, variant))
+
+
+def store_render(name: str, variant: str, data: bytes, path: str = renders_file):
+    """Keep one rendered png in the renders pack."""
+    with SpritePackWriter(path) as writer:
+        writer.add(render_key(name, variant), data)
+
+
+def refresh_renders(names, status_callback=None, path: str = renders_file, source: str = pack_file) -> int:
+    """Re-render the variants that were already rendered for names (e.g. just re-downloaded, so the old render
+    is stale). Sprites nobody has looked at yet stay unrendered. Returns how many renders were written."""
+    rendered = read_index(path)
+    todo = [(name, variant) for name in names for variant in VARIANTS if render_key(name, variant) in rendered]
+    if not todo:
+        return 0
+    written = 0
+    progress = Progress("Rendering sprites", len(todo), status_callback)
+    with SpritePackWriter(path) as writer:
+        for name, variant in todo:
+            data = read_sprite(name, source)
+            try:
+                if data is not None:
+                    writer.add(render_key(name, variant), render_sprite(data, variant))
+                    written += 1
+            except Exception as e: # a broken png shouldn't stop the rest
+                print(f"Could not render {name}: {e}")
+            progress.advance()
+    progress.finish()
+    return written
+
+
+def load_render(name: str, variant: str) -> Image.Image:
+    """The rendered image, rendered and kept in the renders pack the first time it's shown. Rendering them all
+    up front made the pack ten times the size of the cache zip for the sake of one resize per final grade."""
+    data = read_packed(render_key(name, variant), renders_file)
+    if data is not None:
+        return Image.open(io.BytesIO(data))
+    data = read_sprite(name)
+    if data is None:
+        return None
+    image = render_image(data, variant)
+    try:
+        store_render(name, variant, encode_png(image))
+    except OSError as e: # read-only cache folder or the like, it just gets rendered again next time
+        print(f"Could not store render of {name}: {e}")
+    return image
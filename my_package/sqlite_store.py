@@ -0,0 +1,181 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+from my_package.data_store import poke_file, iter_pokemon, sample_other
+
+# optional SQLite backend: startup opens a file instead of parsing every entry, and the big stuff
+# (flavor text, abilities) is only read when a Pokémon actually needs it
+cache_dir = "professor_cache"
+db_file = os.path.join(cache_dir, "professordata.db")
+SCHEMA_VERSION = 1
+LAZY_FIELDS = ("flavor_text", "abilities") # kept out of the main row, loaded on first access
+
+SCHEMA = """
+CREATE TABLE pokemon (
+    id INTEGER NOT NULL,
+    name TEXT PRIMARY KEY,
+    has_flavor_text INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE pokemon_type (name TEXT NOT NULL, type TEXT NOT NULL);
+CREATE TABLE pokemon_egg_group (name TEXT NOT NULL, egg_group TEXT NOT NULL);
+CREATE TABLE flavor_text (name TEXT NOT NULL, position INTEGER NOT NULL, text TEXT NOT NULL);
+CREATE TABLE ability (name TEXT NOT NULL, position INTEGER NOT NULL, ability TEXT NOT NULL, short_effect TEXT);
+CREATE INDEX pokemon_id ON pokemon (id);
+CREATE INDEX pokemon_type_type ON pokemon_type (type, name);
+CREATE INDEX pokemon_egg_group_group ON pokemon_egg_group (egg_group, name);
+CREATE INDEX flavor_text_name ON flavor_text (name, position);
+CREATE INDEX ability_name ON ability (name, position);
+"""
+
+
+def build_database(src: str = poke_file, db: str = db_file, status_callback=None) -> int:
+    """Stream professordata into a fresh SQLite file (built next to it, then swapped in). Returns the entry count."""
+    tmp_db = db + ".tmp"
+    if os.path.exists(tmp_db):
+        os.remove(tmp_db)
+    conn = sqlite3.connect(tmp_db)
+    count = 0
+    try:
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        for entry in iter_pokemon(src):
+            name = entry["name"]
+            flavor_texts = entry.get("flavor_text", []) or []
+            abilities = entry.get("abilities", []) or []
+            record = {k: v for k, v in entry.items() if k not in LAZY_FIELDS}
+            conn.execute("INSERT OR REPLACE INTO pokemon VALUES (?, ?, ?, ?)",
+                         (entry.get("id"), name, 1 if flavor_texts else 0, json.dumps(record, separators=(",", ":"))))
+            conn.executemany("INSERT INTO pokemon_type VALUES (?, ?)", [(name, t) for t in entry.get("types", [])])
+            conn.executemany("INSERT INTO pokemon_egg_group VALUES (?, ?)", [(name, e) for e in entry.get("egg_groups", [])])
+            conn.executemany("INSERT INTO flavor_text VALUES (?, ?, ?)", [(name, i, t) for i, t in enumerate(flavor_texts)])
+            conn.executemany("INSERT INTO ability VALUES (?, ?, ?, ?)",
+                             [(name, i, a.get("name"), a.get("short_effect")) for i, a in enumerate(abilities)])
+            count += 1
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_db, db)
+    msg = f"Built professordata.db ({count} Pokémon)"
+    print(msg)
+    if status_callback:
+        status_callback(msg)
+    return count
+
+
+def database_ready(src: str = poke_file, db: str = db_file) -> bool:
+    """True if the database exists, has our schema, and isn't older than the json lines it was built from."""
+    if not os.path.exists(db):
+        return False
+    if os.path.exists(src) and os.path.getmtime(src) > os.path.getmtime(db):
+        return False
+    try:
+        conn = sqlite3.connect(db)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
+class LazyRecord(dict):
+    """A Pokémon entry that fetches its flavor text and abilities from the database the first time they're read."""
+    def __init__(self, repo, record: dict):
+        super().__init__(record)
+        self.repo = repo
+
+    def _load(self, key):
+        if key == "flavor_text":
+            value = self.repo.flavor_text(self["name"])
+        else:
+            value = self.repo.abilities(self["name"])
+        self[key] = value
+        return value
+
+    def __missing__(self, key):
+        if key in LAZY_FIELDS:
+            return self._load(key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return super().get(key)
+        if key in LAZY_FIELDS:
+            return self._load(key)
+        return default
+
+
+class PokemonRepository:
+    """Small read-only query API over professordata.db. Iterating it gives LazyRecords, like the old list of dicts."""
+    def __init__(self, db: str = db_file):
+        # the app loads on a worker thread and quizzes on the Tk thread, so one connection guarded by a lock
+        self.conn = sqlite3.connect(db, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.pools = {} # with_flavor_text -> names to sample from, read once
+
+    def _query(self, sql: str, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM pokemon")[0][0]
+
+    def __iter__(self):
+        for (record,) in self._query("SELECT record FROM pokemon ORDER BY rowid"):
+            yield LazyRecord(self, json.loads(record))
+
+    def names(self) -> list:
+        """Every name, in file order."""
+        return [name for (name,) in self._query("SELECT name FROM pokemon ORDER BY rowid")]
+
+    def get(self, name: str):
+        """The entry for an exact name, or None."""
+        rows = self._query("SELECT record FROM pokemon WHERE name = ?", (name,))
+        return LazyRecord(self, json.loads(rows[0][0])) if rows else None
+
+    def get_by_id(self, id: int):
+        rows = self._query("SELECT record FROM pokemon WHERE id = ?", (id,))
+        return LazyRecord(self, json.loads(rows[0][0])) if rows else None
+
+    def by_type(self, type_name: str) -> list:
+        return [name for (name,) in self._query("SELECT name FROM pokemon_type WHERE type = ?", (type_name,))]
+
+    def by_egg_group(self, egg_group: str) -> list:
+        return [name for (name,) in self._query("SELECT name FROM pokemon_egg_group WHERE egg_group = ?", (egg_group,))]
+
+    def flavor_text(self, name: str) -> list:
+        return [text for (text,) in self._query("SELECT text FROM flavor_text WHERE name = ? ORDER BY position", (name,))]
+
+    def abilities(self, name: str) -> list:
+        rows = self._query("SELECT ability, short_effect FROM ability WHERE name = ? ORDER BY position", (name,))
+        return [{"name": ability, "short_effect": short_effect} for ability, short_effect in rows]
+
+    def random_other(self, exclude_name: str, with_flavor_text: bool = True, rng=random):
+        """A random entry that isn't exclude_name, by default only from ones that have flavor text."""
+        pool = self.pools.get(with_flavor_text)
+        if pool is None:
+            pool = [name for (name,) in self._query("SELECT name FROM pokemon WHERE has_flavor_text >= ? ORDER BY rowid",
+                                                    (1 if with_flavor_text else 0,))]
+            self.pools[with_flavor_text] = pool
+        name = sample_other(pool, exclude_name, rng)
+        return self.get(name) if name else None
+
+    def sprite_entries(self):
+        """Just the fields cache_sprites needs, without touching flavor text or abilities."""
+        for (record,) in self._query("SELECT record FROM pokemon ORDER BY rowid"):
+            entry = json.loads(record)
+            yield {k: entry.get(k) for k in ("name", "sprite_url", "forms", "form_sprite_url")}
+
+
+def open_repository(src: str = poke_file, db: str = db_file, status_callback=None) -> PokemonRepository:
+    """Open the database, (re)building it from professordata first if it's missing or stale."""
+    if not database_ready(src, db):
+        build_database(src, db, status_callback)
+    return PokemonRepository(db)
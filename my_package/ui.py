@@ -1,23 +1,27 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable, Dict
-from PIL import Image, ImageTk, ImageOps
+from typing import Callable, Dict, List
+from PIL import ImageTk
 import winsound
-import os
+from collections import OrderedDict
+from my_package.sprite_render import load_render
+from my_package.cache_bundle import cache_path
 
 
 DEFAULT_FONT = ('Arial', 16)
 FEEDBACK_FONT = ('Arial', 14)
+SPRITE_CACHE_SIZE = 32 # ready PhotoImages kept for show_sprite
 
 cache_dir = "professor_cache"
   
 
 
 class QuizUI:
-    def __init__(self, root: tk.Tk, on_start_quiz: Callable[[str], None], on_prev_question: Callable, on_next_question: Callable, clear_cache: Callable, on_unit_toggle: Callable[[bool], None]):
+    def __init__(self, root: tk.Tk, on_start_quiz: Callable[[str], None], on_prev_question: Callable, on_next_question: Callable, clear_cache: Callable, on_unit_toggle: Callable[[bool], None], on_suggest: Callable[[str], List[str]] = None):
         """Initialize the UI."""
         self.root = root
         self.on_start_quiz = on_start_quiz
+        self.on_suggest = on_suggest # name -> autocomplete suggestions, optional
         self.on_prev_question = on_prev_question
         self.on_next_question = on_next_question
         self.clear_cache = clear_cache
@@ -37,14 +41,17 @@ class QuizUI:
         self.next_button = None
         self.pokemon_entry = None
         self.unit_var = None  # For unit toggle
-
-        # Themes for answers
-        self.correct_sound = os.path.join(cache_dir, "correct.wav")
-        self.incorrect_sound = os.path.join(cache_dir,"incorrect.wav")
-        self.partial_correct_sound = os.path.join(cache_dir, "partial_correct.wav")
+        self.suggestion_list = None
+        self.suggest_job = None # pending after() call, so we only search once typing pauses
+        self.sprite_images = OrderedDict() # (sprite name, variant) -> PhotoImage, least recently shown first
+
+        # Themes for answers (copied out of professor_cache.zip the first time if that's the only place they are)
+        self.correct_sound = cache_path("correct.wav")
+        self.incorrect_sound = cache_path("incorrect.wav")
+        self.partial_correct_sound = cache_path("partial_correct.wav")
         # Themes for final grade
-        self.victory_theme = os.path.join(cache_dir,"victory.wav")
-        self.failure_theme = os.path.join(cache_dir,"failure.wav")
+        self.victory_theme = cache_path("victory.wav")
+        self.failure_theme = cache_path("failure.wav")
 
         self.setup_ui()
 
@@ -59,10 +66,19 @@ class QuizUI:
         self.pokemon_entry = ttk.Entry(
             search_frame, width=15, font=DEFAULT_FONT)
         self.pokemon_entry.pack(side="left", padx=5)
-        self.pokemon_entry.bind('<Return>', lambda e: self.on_start_quiz(
-            self.pokemon_entry.get().strip()))
-        ttk.Button(search_frame, text="Start Quiz", command=lambda: self.on_start_quiz(
-            self.pokemon_entry.get().strip()), style='Large.TButton').pack(side="left", padx=5)
+        self.pokemon_entry.bind('<Return>', lambda e: self.submit_search())
+        self.pokemon_entry.bind('<KeyRelease>', self.schedule_suggestions)
+        self.pokemon_entry.bind('<Down>', lambda e: self.focus_suggestions())
+        self.pokemon_entry.bind('<Escape>', lambda e: self.show_suggestions([]))
+        ttk.Button(search_frame, text="Start Quiz", command=self.submit_search, style='Large.TButton').pack(side="left", padx=5)
+
+        # Autocomplete/"did you mean" list, only packed while there's something in it
+        suggestion_frame = ttk.Frame(self.root)
+        suggestion_frame.pack(padx=10, fill="x")
+        self.suggestion_list = tk.Listbox(suggestion_frame, height=5, width=20, font=FEEDBACK_FONT, activestyle="none", exportselection=False)
+        self.suggestion_list.bind('<ButtonRelease-1>', lambda e: self.pick_suggestion())
+        self.suggestion_list.bind('<Return>', lambda e: self.pick_suggestion())
+        self.suggestion_list.bind('<Escape>', lambda e: self.show_suggestions([]))
 
         # Unit toggle frame
         unit_frame = ttk.Frame(self.root)
@@ -117,6 +133,53 @@ class QuizUI:
         style.configure('Large.TCheckbutton', font=DEFAULT_FONT)
         style.configure('warning.Outline.TButton', font=FEEDBACK_FONT, foreground='red', borderwidth=2)
 
+    def submit_search(self):
+        """Start the quiz for whatever is typed in the search box."""
+        self.show_suggestions([])
+        self.on_start_quiz(self.pokemon_entry.get().strip())
+
+    def schedule_suggestions(self, event=None):
+        """Refresh autocomplete shortly after typing stops, instead of on every single key."""
+        if event is not None and event.keysym in ("Return", "Down", "Up", "Escape"):
+            return
+        if self.suggest_job:
+            self.root.after_cancel(self.suggest_job)
+        self.suggest_job = self.root.after(120, self.update_suggestions)
+
+    def update_suggestions(self):
+        self.suggest_job = None
+        text = self.pokemon_entry.get().strip()
+        names = self.on_suggest(text) if self.on_suggest and len(text) >= 2 else []
+        self.show_suggestions(names)
+
+    def show_suggestions(self, names: List[str]):
+        """Fill the suggestion list, or hide it if there's nothing to show."""
+        self.suggestion_list.delete(0, "end")
+        if not names:
+            self.suggestion_list.pack_forget()
+            return
+        for name in names:
+            self.suggestion_list.insert("end", name)
+        self.suggestion_list.config(height=len(names))
+        self.suggestion_list.pack(side="left", padx=(95, 5)) # roughly lined up under the entry box
+
+    def focus_suggestions(self):
+        if self.suggestion_list.size():
+            self.suggestion_list.focus_set()
+            self.suggestion_list.selection_clear(0, "end")
+            self.suggestion_list.selection_set(0)
+            self.suggestion_list.activate(0)
+
+    def pick_suggestion(self):
+        """Put the chosen suggestion in the search box and start its quiz."""
+        selection = self.suggestion_list.curselection()
+        if not selection:
+            return
+        name = self.suggestion_list.get(selection[0])
+        self.pokemon_entry.delete(0, "end")
+        self.pokemon_entry.insert(0, name)
+        self.submit_search()
+
     def update_score(self, score: int, total_questions: int):
         """Update the score label."""
         self.score_label.config(text=f"Score: {score}/{total_questions}")
@@ -193,34 +256,27 @@ class QuizUI:
                 entry.config(state="disabled")
         if not answered and question["type"] != "boolean":
             entry.bind('<Return>', lambda e: submit_answer())
-    def show_sprite(self, sprite_path: str, grayscale: bool = False):
-        """Fetch and display the Pokémon sprite."""
+    def show_sprite(self, sprite_name: str, grayscale: bool = False):
+        """Display the Pokémon sprite, e.g. "bulbasaur.png", at 200x200, rendered once and then read back."""
+        key = (sprite_name, "grayscale" if grayscale else "color")
         try:
-            if os.path.isfile(sprite_path):
-                image = Image.open(sprite_path)
-                if grayscale:
-                    # Convert to RGBA if not already
-                    if image.mode != 'RGBA':
-                        image = image.convert('RGBA')
-                    
-                    # Split the image into channels
-                    r, g, b, a = image.split()
-                    
-                    # Convert RGB to grayscale while preserving alpha
-                    gray = ImageOps.grayscale(image)
-                    
-                    # Create new image with grayscale RGB and original alpha
-                    image = Image.merge('RGBA', (gray, gray, gray, a))
-                
-                image = image.resize((200, 200), Image.Resampling.LANCZOS)
+            photo = self.sprite_images.get(key)
+            if photo is None:
+                image = load_render(*key)
+                if image is None:
+                    print(f"Sprite not found: {sprite_name}")
+                    return
                 photo = ImageTk.PhotoImage(image)
-                self.sprite_label.config(image=photo)
-                self.sprite_label.image = photo  # Keep a reference
-                
-                # Update window size to accommodate sprite
-                self.root.update_idletasks()
+                self.sprite_images[key] = photo
+                if len(self.sprite_images) > SPRITE_CACHE_SIZE:
+                    self.sprite_images.popitem(last=False)
             else:
-                print(f"Sprite not found: {sprite_path}")
+                self.sprite_images.move_to_end(key)
+            self.sprite_label.config(image=photo)
+            self.sprite_label.image = photo  # Keep a reference
+
+            # Update window size to accommodate sprite
+            self.root.update_idletasks()
         except Exception as e:
             print(f"Error loading sprite: {e}")
 
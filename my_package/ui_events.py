@@ -0,0 +1,62 @@
+import queue
+
+# worker threads never touch Tk: they post events here, and the Tk main loop drains the queue a frame at a time.
+# progress channels only show their latest message per frame, so a thousand sprite updates cost one label change
+FRAME_MS = 33 # about 30 redraws a second
+
+
+class UIEventBus:
+    """Thread-safe mailbox for the Tk thread. post() a message to a channel, or call() a function, from anywhere;
+    the handlers and functions run on the main loop, in the order they were sent."""
+    def __init__(self, root, frame_ms: int = FRAME_MS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.queue = queue.SimpleQueue()
+        self.handlers = {} # channel -> handler(message)
+        self.coalesced = set() # channels where only the newest message in a frame matters
+        self.job = None
+
+    def subscribe(self, channel: str, handler, coalesce: bool = True):
+        """Run handler(message) on the Tk thread for every message posted to channel (just the latest per frame if coalesce)."""
+        self.handlers[channel] = handler
+        if coalesce:
+            self.coalesced.add(channel)
+
+    def post(self, channel: str, message):
+        """Send a message to a channel. Never blocks, never touches a widget."""
+        self.queue.put((channel, message))
+
+    def call(self, func, *args):
+        """Run func(*args) on the Tk thread, e.g. to pack or forget a widget."""
+        self.queue.put((None, (func, args)))
+
+    def start(self):
+        if self.job is None:
+            self.job = self.root.after(self.frame_ms, self.drain)
+
+    def stop(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+    def drain(self):
+        """Handle everything queued since the last frame, then schedule the next one."""
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        last = {channel: i for i, (channel, _) in enumerate(events) if channel in self.coalesced}
+        for i, (channel, payload) in enumerate(events):
+            try:
+                if channel is None:
+                    func, args = payload
+                    func(*args)
+                elif channel not in self.coalesced or last[channel] == i: # older progress in this frame is stale already
+                    handler = self.handlers.get(channel)
+                    if handler:
+                        handler(payload)
+            except Exception as e: # one bad handler shouldn't stop the loop that keeps the window alive
+                print(f"UI event failed: {e}")
+        self.job = self.root.after(self.frame_ms, self.drain)
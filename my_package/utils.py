@@ -20,6 +20,19 @@ def load_unit_preference():
             USE_METRIC = True
     return USE_METRIC
 
+def load_storage_preference() -> bool:
+    """Whether to query professordata through the SQLite backend ("use_sqlite" in utility.json, off by default)."""
+    cache_dir = "professor_cache"
+    util_file = os.path.join(cache_dir, "utility.json")
+
+    if os.path.exists(util_file):
+        try:
+            with open(util_file, 'r') as f:
+                return bool(json.load(f).get('use_sqlite', False))
+        except:
+            return False
+    return False
+
 def save_unit_preference(use_metric: bool):
     """Save the unit system preference to cache."""
     cache_dir = "professor_cache"
@@ -57,10 +70,10 @@ def meters_to_feet_inches(meters: float) -> str:
     inches = round(total_inches % 12)
     return f"{feet}'{inches}\""
 
-def format_height(height_dm: float) -> str:
-    """Format height based on the current unit system."""
+def format_height(height_dm: float, use_metric: bool = None) -> str:
+    """Format height based on the current unit system (or use_metric, if given)."""
     height_m = height_dm / 10
-    if USE_METRIC:
+    if USE_METRIC if use_metric is None else use_metric:
         return f"{height_m:.1f}m"
     else:
         return meters_to_feet_inches(height_m)
@@ -69,9 +82,9 @@ def kg_to_lbs(kg: float) -> float:
     """Convert kilograms to pounds."""
     return kg * 2.20462
 
-def format_weight(weight_kg: float) -> float:
-    """Format weight based on the current unit system."""
-    if USE_METRIC:
+def format_weight(weight_kg: float, use_metric: bool = None) -> float:
+    """Format weight based on the current unit system (or use_metric, if given)."""
+    if USE_METRIC if use_metric is None else use_metric:
         return f"{weight_kg:.1f}kg"
     else:
         return f"{round(kg_to_lbs(weight_kg), 1)}lbs"